@@ -0,0 +1,114 @@
+import io
+import os
+import csv
+import time
+import contextlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from .GitLog import GitLog
+from .GitAnalysis import GitAnalysis
+
+
+class Batch():
+    # Analysis of many repositories in a process pool. Every repository is exported to its own
+    # dataset (outdir/output_<name>.csv as read by run_analysis.py), its stable releases and
+    # fault score are computed and a summary row with the timings is returned per repository.
+    fields = ['repo', 'commits', 'tags', 'stable_releases', 'last_stable_release', 'fault_score', 'fault_score_max',
+              'export_s', 'ingest_s', 'analysis_s', 'total_s', 'error']
+
+    def __init__(self, paths, outdir='data', min_dt=90, relative_band=0.005, attr='lines_altered', processes=None):
+        self.paths = list(paths)
+        self.outdir = outdir
+        self.min_dt = min_dt
+        self.relative_band = relative_band
+        self.attr = attr
+        self.processes = processes
+
+    def jobs(self):
+        jobs = []
+        names = set()
+        for path in self.paths:
+            name = Batch.name(path)
+            # Repositories with the same folder name get a numbered dataset each
+            unique = name
+            k = 1
+            while unique in names:
+                k += 1
+                unique = f'{name}_{k}'
+            names.add(unique)
+            fn = os.path.join(self.outdir, f'output_{unique}.csv')
+            jobs.append((path, unique, fn, self.min_dt, self.relative_band, self.attr))
+        return jobs
+
+    def run(self):
+        os.makedirs(self.outdir, exist_ok=True)
+        jobs = self.jobs()
+        if self.processes == 1:
+            return [Batch.analyse(job) for job in jobs]
+        with ProcessPoolExecutor(self.processes) as pool:
+            return list(pool.map(Batch.analyse, jobs))
+
+    @staticmethod
+    def name(path):
+        return os.path.basename(os.path.normpath(os.path.abspath(path)))
+
+    @staticmethod
+    def analyse(job):
+        [path, name, fn, min_dt, relative_band, attr] = job
+        row = {x: None for x in Batch.fields}
+        row['repo'] = name
+        row['error'] = ''
+        start = time.perf_counter()
+        try:
+            if not os.path.isdir(path):
+                raise Exception(f'{path} is not a directory!')
+            if GitLog(path).export_csv(fn) == 0:
+                raise Exception(f'No commits found in {path}!')
+            row['export_s'] = time.perf_counter() - start
+
+            # The worker output would interleave, the analysis runs quiet
+            with contextlib.redirect_stdout(io.StringIO()):
+                step = time.perf_counter()
+                analysis = GitAnalysis(name)
+                analysis.import_csv(fn)
+                row['ingest_s'] = time.perf_counter() - step
+
+                step = time.perf_counter()
+                [t, y, tags] = analysis.series(attr)
+                [is_at_steady_state, idx_ranges] = GitAnalysis.findSteadyState(t, y, min_dt, relative_band)
+                stable_releases = [tags[i] for i in GitAnalysis.findStableReleases(tags, idx_ranges)]
+                # Parameter as in GitAnalysis.plot2
+                alfa = -1.0 * np.log(0.05) / 30
+                p = GitAnalysis.fault_score(t, y, alfa)
+                row['analysis_s'] = time.perf_counter() - step
+                del analysis
+
+            row['commits'] = t.size
+            row['tags'] = sum(1 for x in tags if x)
+            row['stable_releases'] = ' '.join(stable_releases)
+            row['last_stable_release'] = stable_releases[-1] if stable_releases else ''
+            row['fault_score'] = float(p[-1]) if p.size else 0.0
+            row['fault_score_max'] = float(p.max()) if p.size else 0.0
+        except Exception as e:
+            row['error'] = f'{type(e).__name__}: {e}'
+        row['total_s'] = time.perf_counter() - start
+        return row
+
+    @staticmethod
+    def export_csv(rows, fn):
+        with open(fn, 'w', newline='') as csv_file:
+            csv_writer = csv.writer(csv_file, delimiter=",")
+            csv_writer.writerow(Batch.fields)
+            for row in rows:
+                csv_writer.writerow([row[x] for x in Batch.fields])
+
+    @staticmethod
+    def print_summary(rows):
+        print(f'{"repo":24s} {"commits":>8s} {"tags":>5s} {"stable":>6s} {"last stable":16s} {"fault score":>12s} {"total [s]":>9s}')
+        for r in rows:
+            if r['error']:
+                print(f'{r["repo"]:24s} {r["error"]}')
+                continue
+            n_stable = len(r['stable_releases'].split())
+            print(f'{r["repo"]:24s} {r["commits"]:8d} {r["tags"]:5d} {n_stable:6d} {r["last_stable_release"]:16s} {r["fault_score"]:12.1f} {r["total_s"]:9.2f}')
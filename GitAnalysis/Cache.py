@@ -0,0 +1,96 @@
+import os
+import json
+import shutil
+import warnings
+import numpy as np
+
+from .CommitTable import CommitTable
+
+
+class Cache():
+    # Binary cache of parsed data: a directory with one .npy file per column and a versioned
+    # header.json, columns are loaded memory mapped. A commit table cache is valid only for
+    # the CSV file (size and modification time) it was built from.
+    format = 'GitAnalysis cache'
+    version = 1
+    stats_fields = ['file', 'line', 'timeend', 'timestart', 'timespan', 'commit']
+
+    @staticmethod
+    def path(fn):
+        return f'{fn}.cache'
+
+    @staticmethod
+    def save(path, columns, source=None):
+        # False if the cache could not be written (e.g. read-only data directory), the caller
+        # continues without it
+        tmp = f'{path}.tmp'
+        try:
+            if os.path.exists(tmp):
+                shutil.rmtree(tmp)
+            os.makedirs(tmp)
+            for name, column in columns.items():
+                np.save(os.path.join(tmp, f'{name}.npy'), np.asarray(column))
+            header = {
+                'format': Cache.format,
+                'version': Cache.version,
+                'source': source,
+                'columns': list(columns)
+            }
+            with open(os.path.join(tmp, 'header.json'), 'w') as f:
+                json.dump(header, f)
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            os.rename(tmp, path)
+        except OSError as e:
+            shutil.rmtree(tmp, ignore_errors=True)
+            warnings.warn(f'Cache {path} not saved: {e}')
+            return False
+        return True
+
+    @staticmethod
+    def load(path, source=None):
+        # Columns or None if there is no valid cache (missing, truncated or of another source)
+        try:
+            with open(os.path.join(path, 'header.json'), 'r') as f:
+                header = json.load(f)
+            if header.get('format') != Cache.format or header.get('version') != Cache.version or header.get('source') != source:
+                return None
+            columns = {}
+            for name in header['columns']:
+                columns[name] = np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        return columns
+
+    @staticmethod
+    def source(fn):
+        st = os.stat(fn)
+        return {'file': os.path.basename(fn), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+    @staticmethod
+    def save_table(table, fn):
+        Cache.save(Cache.path(fn), table.columns, Cache.source(fn))
+
+    @staticmethod
+    def load_table(fn):
+        columns = Cache.load(Cache.path(fn), Cache.source(fn))
+        if columns is None:
+            return None
+        return CommitTable(columns)
+
+    @staticmethod
+    def save_stats(stats, fn):
+        # stats as gathered by GitCommit2.track() (list of dicts) or as columns, 'commit' is
+        # missing in the stats of older runs
+        if isinstance(stats, dict):
+            columns = stats
+        else:
+            fields = [x for x in Cache.stats_fields if not stats or x in stats[0]]
+            columns = {x: [s[x] for s in stats] for x in fields}
+        dtypes = {'file': str, 'line': np.int64, 'timeend': float, 'timestart': float, 'timespan': float, 'commit': str}
+        columns = {x: np.asarray(columns[x], dtype=dtypes[x]) for x in Cache.stats_fields if x in columns}
+        Cache.save(fn, columns)
+
+    @staticmethod
+    def load_stats(fn):
+        return Cache.load(fn)
@@ -0,0 +1,160 @@
+import csv
+import time
+import warnings
+import numpy as np
+
+from .GitLog import GitLog
+
+
+class CommitTable():
+    # Commit history as typed columns in GitCommit.fields order, parsed once when loaded
+    string_fields = ['commit_id', 'author', 'date', 'tag']
+    int_fields = ['changed_files', 'lines_added', 'lines_deleted']
+
+    def __init__(self, columns):
+        for x in CommitTable.string_fields:
+            setattr(self, x, np.asarray(columns[x], dtype=str))
+        for x in CommitTable.int_fields:
+            setattr(self, x, np.asarray(columns[x], dtype=np.int64))
+        if 'timestamp' in columns:
+            self.timestamp = np.asarray(columns['timestamp'], dtype=float)
+        else:
+            self.timestamp = CommitTable.timestamps(self.date)
+
+    def __len__(self):
+        return self.commit_id.size
+
+    @property
+    def columns(self):
+        return {x: getattr(self, x) for x in GitLog.fields + ['timestamp']}
+
+    @property
+    def lines_altered(self):
+        return self.lines_added + self.lines_deleted
+
+    @property
+    def lines_weighted(self):
+        added = self.lines_added
+        deleted = self.lines_deleted
+        changed = np.maximum(added, deleted)
+        more_added = added >= deleted
+        added = np.where(more_added, added - changed, 0)
+        deleted = np.where(more_added, 0, deleted - changed)
+        return 1*changed + 1.5*added + 0.2*deleted
+
+    def rolling(self, window, at=None, step=None, attrs=('lines_altered', 'lines_weighted', 'changed_files'),
+                quantiles=(0.5,)):
+        # Columns of the commits in the window (t - window, t] [days] at every evaluation time t:
+        #   t, tag, commits, authors (distinct) and <attr>_sum, <attr>_mean, <attr>_p<q*100> per attr
+        # Evaluated at the tags by default, on a regular grid of step days or at the given times.
+        # Sums and counts come from prefix sums and np.searchsorted, the authors from two pointers.
+        order = np.argsort(self.timestamp, kind='stable')
+        ts = self.timestamp[order]
+        if at is not None:
+            t = np.asarray(at, dtype=float)
+            tag = np.full(t.size, '')
+        elif step is not None:
+            n = max(1, int(np.ceil((ts[-1] - ts[0]) / step))) if ts.size else 0
+            t = ts[0] + step*np.arange(1, n + 1) if ts.size else np.zeros(0)
+            tag = np.full(t.size, '')
+        else:
+            tagged = self.tag[order] != ''
+            t = ts[tagged]
+            tag = self.tag[order][tagged]
+        hi = np.searchsorted(ts, t, 'right')
+        lo = np.searchsorted(ts, t - window, 'right')
+        count = hi - lo
+        out = {'t': t, 'tag': tag, 'commits': count}
+
+        # Distinct authors, the windows in time order so that both ends only move forward
+        [authors, author] = np.unique(self.author[order], return_inverse=True)
+        author = author.ravel().tolist()
+        counts = [0]*authors.size
+        distinct = np.zeros(t.size, dtype=np.int64)
+        [i, j, k] = [0, 0, 0]
+        for w in np.argsort(t, kind='stable').tolist():
+            while j < hi[w]:
+                counts[author[j]] += 1
+                k += counts[author[j]] == 1
+                j += 1
+            while i < lo[w]:
+                counts[author[i]] -= 1
+                k -= counts[author[i]] == 0
+                i += 1
+            distinct[w] = k
+        out['authors'] = distinct
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for attr in attrs:
+                v = np.asarray(getattr(self, attr), dtype=float)[order]
+                cum = np.concatenate(([0.0], np.cumsum(v)))
+                out[f'{attr}_sum'] = cum[hi] - cum[lo]
+                out[f'{attr}_mean'] = np.where(count > 0, out[f'{attr}_sum'] / count, np.nan)
+                for q in quantiles:
+                    out[f'{attr}_p{q*100:g}'] = np.array([np.quantile(v[a:b], q) if b > a else np.nan
+                                                          for a, b in zip(lo.tolist(), hi.tolist())])
+        return out
+
+    @staticmethod
+    def export_csv(columns, fn):
+        # Columns of the same length, e.g. rolling(), as a CSV file
+        with open(fn, 'w', newline='') as csv_file:
+            csv_writer = csv.writer(csv_file, delimiter=",")
+            csv_writer.writerow(list(columns))
+            for row in zip(*[np.asarray(x).tolist() for x in columns.values()]):
+                csv_writer.writerow(row)
+
+    @staticmethod
+    def from_rows(rows):
+        columns = list(zip(*rows))
+        if not columns:
+            columns = [[] for x in GitLog.fields]
+        return CommitTable(dict(zip(GitLog.fields, columns)))
+
+    @staticmethod
+    def from_csv(fn):
+        with open(fn, 'r') as csv_file:
+            csv_reader = csv.reader(csv_file, delimiter=",")
+            header = next(csv_reader)
+            if not ",".join(GitLog.fields) == ",".join(header):
+                raise Exception(f'CSV fields in {fn} do not match! Please check the CSV file!\n{",".join(GitLog.fields)}\n{",".join(header)}')
+            return CommitTable.from_rows(CommitTable.repair_rows(csv_reader, fn))
+
+    @staticmethod
+    def repair_rows(rows, fn=''):
+        # gitlogs2csv.sh writes the author unquoted, the extra fields of an author with commas
+        # ("Doe, John") are joined back, rows with missing fields are skipped with a warning
+        n = len(GitLog.fields)
+        author = GitLog.fields.index('author')
+        tail = n - author - 1
+        skipped = 0
+        for r in rows:
+            if len(r) > n:
+                r = r[:author] + [','.join(r[author:len(r) - tail])] + r[len(r) - tail:]
+            elif len(r) < n:
+                skipped += len(r) > 0
+                continue
+            yield r
+        if skipped:
+            warnings.warn(f'{skipped} rows of {fn} with missing fields are skipped!')
+
+    @staticmethod
+    def concatenate(tables):
+        columns = {}
+        for x in GitLog.fields + ['timestamp']:
+            columns[x] = np.concatenate([getattr(t, x) for t in tables])
+        return CommitTable(columns)
+
+    @staticmethod
+    def timestamps(dates):
+        # Days since epoch of the local '%Y-%m-%d %H:%M:%S' dates, same as time.mktime() per date.
+        # Parsed as UTC in one go, the local UTC offset is looked up once per distinct hour.
+        if dates.size == 0:
+            return np.zeros(0)
+        utc = dates.astype('datetime64[s]').astype(np.int64)
+        [hours, inverse] = np.unique(utc // 3600, return_inverse=True)
+        offsets = np.empty(hours.size)
+        for i, h in enumerate(hours.tolist()):
+            # Local time of the hour with the DST flag left to mktime
+            offsets[i] = time.mktime(time.gmtime(h*3600)[:8] + (-1,)) - h*3600
+        return (utc + offsets[inverse.ravel()]) / (3600*24)
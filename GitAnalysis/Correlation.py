@@ -0,0 +1,154 @@
+import csv
+import re
+import numpy as np
+
+from .GitLog import GitLog
+
+
+class Correlation():
+    # Code churn of the releases against the bug arrival. The commits come from a CommitTable, the
+    # bugs as ids and opening timestamps [s] (Bugzilla.fetch_opened) and the fix commits are
+    # linked to the bugs by the references in the commit messages (Correlation.scan).
+    fields = ['release', 'timestamp', 'commits', 'churn', 'bugs', 'bugs_window', 'bugs_per_kloc',
+              'fixes', 'fixed_bugs', 'fix_churn', 'days_to_fix']
+    # Bug references, one group with the bug id per pattern. A bare number after fixes/closes is
+    # no reference ('Fixes: <sha>' trailers, 'fix 2 typos'), the ids end at a word boundary.
+    patterns = [
+        r'\b(?:close[sd]?|fix(?:e[sd])?|resolve[sd]?)\s*:?\s*(?:bug\s*#?\s*|#)(\d+)\b',
+        r'\bbug\s*#?\s*(\d+)\b',
+        r'\bbz\s*#?\s*(\d+)\b',
+        r'show_bug\.cgi\?id=(\d+)\b'
+    ]
+
+    def __init__(self, table, bug_ids, opened, refs=(), window=90):
+        # table - CommitTable, e.g. GitAnalysis.commits
+        # bug_ids, opened - bug ids and opening timestamps [s]
+        # refs - (commit_id, bug_id) pairs, e.g. Correlation.scan(path)
+        # window - bugs_window counts the bugs opened in this many days after the release
+        self.table = table
+        self.bug_ids = np.asarray(bug_ids, dtype=np.int64)
+        self.opened = np.asarray(opened, dtype=float) / (24*3600)
+        self.window = window
+        [self.fix_commit, self.fix_bug] = self.link(refs)
+
+    @staticmethod
+    def scanner(patterns=None):
+        # All the patterns as one precompiled alternation, a message is scanned once
+        patterns = patterns if patterns is not None else Correlation.patterns
+        return re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+
+    @staticmethod
+    def scan(path, patterns=None):
+        # (commit_id, bug_id) references of all the commits from a single 'git log' stream
+        return Correlation.scan_lines(GitLog.stream_shell_command(f"""
+            cd {path} && git log --all --reverse --pretty=format:'{GitLog.marker}%h%n%B'
+            """), patterns)
+
+    @staticmethod
+    def scan_lines(lines, patterns=None):
+        # Messages as '<marker><commit_id>' lines followed by the message lines
+        scanner = Correlation.scanner(patterns)
+        commit_id = None
+        seen = set()
+        for o in lines:
+            if o.startswith(GitLog.marker):
+                commit_id = o[1:]
+                seen = set()
+                continue
+            if commit_id is None:
+                continue
+            for m in scanner.finditer(o):
+                bug_id = int(m.group(m.lastindex))
+                if bug_id not in seen:
+                    seen.add(bug_id)
+                    yield (commit_id, bug_id)
+
+    def link(self, refs):
+        # [commit index, bug index] of the references to known commits and bugs, hash joins on
+        # the commit ids and the bug ids, references to other numbers are dropped
+        commit_index = {c: i for i, c in enumerate(self.table.commit_id.tolist())}
+        bug_index = {b: i for i, b in enumerate(self.bug_ids.tolist())}
+        pairs = set()
+        for commit_id, bug_id in refs:
+            i = commit_index.get(commit_id)
+            j = bug_index.get(bug_id)
+            if i is not None and j is not None:
+                pairs.add((i, j))
+        if not pairs:
+            return [np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)]
+        pairs = np.array(sorted(pairs), dtype=np.int64)
+        return [pairs[:, 0], pairs[:, 1]]
+
+    def releases(self):
+        # Columns of Correlation.fields, one row per tag in time order and 'unreleased' last:
+        #   commits, churn (lines altered) - the commits shipped first in the release
+        #   bugs, bugs_window - the bugs opened while it was the latest release / in window days
+        #   fixes, fixed_bugs, fix_churn - the commits referencing bugs, the bugs they reference
+        #   days_to_fix - median days from the opening of the bug to its fix commit
+        t = self.table.timestamp
+        order = np.argsort(t, kind='stable')
+        tagged = np.flatnonzero(self.table.tag[order] != '')
+        names = self.table.tag[order][tagged].tolist() + ['unreleased']
+        release_t = t[order][tagged]
+        m = len(names)
+        release = np.empty(t.size, dtype=np.int64)
+        release[order] = np.searchsorted(tagged, np.arange(t.size), 'left')
+        churn = self.table.lines_altered.astype(float)
+        out = {x: None for x in Correlation.fields}
+        out['release'] = names
+        out['timestamp'] = np.append(release_t, np.nan)
+        out['commits'] = np.bincount(release, minlength=m)
+        out['churn'] = np.bincount(release, weights=churn, minlength=m)
+
+        # Bugs after the latest release at their opening, the ones before the first release are left out
+        bug_release = np.searchsorted(release_t, self.opened, 'right') - 1
+        bug_release = bug_release[bug_release >= 0]
+        out['bugs'] = np.bincount(bug_release, minlength=m)
+        opened = np.sort(self.opened)
+        out['bugs_window'] = np.append(np.searchsorted(opened, release_t + self.window, 'left') -
+                                       np.searchsorted(opened, release_t, 'left'), 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out['bugs_per_kloc'] = np.where(out['churn'] > 0, 1000 * out['bugs'] / out['churn'], np.nan)
+
+        fixes = np.unique(self.fix_commit)
+        out['fixes'] = np.bincount(release[fixes], minlength=m)
+        out['fix_churn'] = np.bincount(release[fixes], weights=churn[fixes], minlength=m)
+        # A bug fixed by several commits of a release counts once, at its last fix
+        g = release[self.fix_commit]
+        lag = t[self.fix_commit] - self.opened[self.fix_bug]
+        idx = np.lexsort((-lag, self.fix_bug, g))
+        first = np.ones(idx.size, dtype=bool)
+        first[1:] = (g[idx][1:] != g[idx][:-1]) | (self.fix_bug[idx][1:] != self.fix_bug[idx][:-1])
+        g = g[idx][first]
+        lag = lag[idx][first]
+        out['fixed_bugs'] = np.bincount(g, minlength=m)
+        # Median per release from the lags sorted within the releases
+        idx = np.lexsort((lag, g))
+        g = g[idx]
+        lag = lag[idx]
+        counts = out['fixed_bugs']
+        start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        has = counts > 0
+        lower = lag[(start + (counts - 1) // 2)[has]]
+        upper = lag[(start + counts // 2)[has]]
+        out['days_to_fix'] = np.full(m, np.nan)
+        out['days_to_fix'][has] = (lower + upper) / 2
+        return out
+
+    def correlation(self, x='churn', y='bugs'):
+        # Pearson correlation of two release columns over the tagged releases
+        out = self.releases()
+        a = np.asarray(out[x][:-1], dtype=float)
+        b = np.asarray(out[y][:-1], dtype=float)
+        valid = np.isfinite(a) & np.isfinite(b)
+        if valid.sum() < 2 or a[valid].std() == 0 or b[valid].std() == 0:
+            return float('nan')
+        return float(np.corrcoef(a[valid], b[valid])[0, 1])
+
+    @staticmethod
+    def export_csv(out, fn):
+        with open(fn, 'w', newline='') as csv_file:
+            csv_writer = csv.writer(csv_file, delimiter=",")
+            csv_writer.writerow(Correlation.fields)
+            for row in zip(*[out[x] for x in Correlation.fields]):
+                csv_writer.writerow(row)
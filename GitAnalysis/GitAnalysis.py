@@ -1,19 +1,26 @@
-import csv
+import os
+import re
 import time
+import heapq
 import datetime
 import numpy as np
 import subprocess
-import re
+import shlex
 import warnings
-import copy
-
-
-import matplotlib 
-matplotlib.use("TkAgg")
-import matplotlib.pyplot as matplt
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .GitLog import GitLog
+from .GitDiff import GitDiff
+from .LineTracker import LineTracker
+from .TrackerHistory import TrackerHistory
+from .Kernels import ExponentialKernel, WeibullKernel
+from .CommitTable import CommitTable
+from .Cache import Cache
+from .GitTags import GitTags
+from .Render import Render
 
 class GitCommit():
-    fields = ['commit_id','author','date','changed_files','lines_added','lines_deleted','tag']
+    fields = GitLog.fields
     def __init__(self, r):
         self.values = {}
         for idx, x in enumerate(self.fields):
@@ -50,10 +57,15 @@ class GitCommit():
         return ",".join(GitCommit.fields)
 
 class GitCommit2():
+    # Header line of a group of lines in 'git blame --porcelain': <hash> <orig line> <final line> [<lines>]
+    ptrn_blame = re.compile(r'^[0-9a-f]{40,64} \d+ \d+')
+
     def __init__(self, path):
         self.path = path
 
-    def get_all_commits(self):
+    def get_all_commits(self, batched=True):
+        if batched:
+            return list(self.iter_commits())
         out = GitCommit2.execute_shell_command(f"""
             cd {self.path} && git log --all --topo-order --reverse --date=local --date=format-local:'%Y-%m-%d %H:%M:%S' --pretty=format:"%h,%an,%ad"
             """)
@@ -71,142 +83,155 @@ class GitCommit2():
             commits.append(c)
         return commits
 
+    def iter_commits(self):
+        # Patch-ids of the whole history come from one 'git log -p | git patch-id' pipeline
+        # running alongside the commit listing, commits without diff (merges) get ['']
+        patch_ids = GitLog.stream_shell_command(f"""
+            cd {self.path} && git log --all --topo-order --reverse -p --format='commit %H' | git patch-id
+            """)
+        patch_id = next(patch_ids, '').split(' ')
+        sep = GitLog.separator
+        for o in GitLog.stream_shell_command(f"""
+            cd {self.path} && git log --all --topo-order --reverse --date=local --date=format-local:'%Y-%m-%d %H:%M:%S' --pretty=format:"%H{sep}%h{sep}%an{sep}%ad"
+            """):
+            v = o.split(sep)
+            if len(v) != 4:
+                continue
+            c = {}
+            c['id'] = v[1]
+            c['author'] = v[2]
+            c['timestamp'] = GitCommit2.timestamp(v[3])
+            if patch_id[-1] == v[0]:
+                c['patch-id'] = patch_id
+                patch_id = next(patch_ids, '').split(' ')
+            else:
+                c['patch-id'] = ['']
+            yield c
+
     def get_all_tags(self):
+        return GitTags(self.path).tags
+
+    def get_files(self, commit_id='HEAD'):
+        out = GitCommit2.execute_shell_command(f"""
+            cd {self.path} && git ls-tree -r --name-only {commit_id}
+            """)
+        return set(o for o in out if o)
+
+    def blame_snapshot(self, commits, workers=8):
+        # {commit: {file: LineTracker}} of the files at the given commits (e.g. get_all_tags() values),
+        # the origin commit of every line from 'git blame --porcelain' run for all (commit, file) pairs
+        # in a thread pool instead of replaying the history with track(). The born clocks are 0.
+        commits = list(dict.fromkeys(commits))
+        short = self.get_short_hashes()
+        jobs = [(c, f) for c in commits for f in sorted(self.get_files(c))]
+        with ThreadPoolExecutor(workers) as pool:
+            runs = list(pool.map(lambda job: self.blame_runs(job[0], job[1], short), jobs))
+        snapshot = {c: {} for c in commits}
+        for [c, f], r in zip(jobs, runs):
+            snapshot[c][f] = LineTracker.from_runs(r)
+        return snapshot
+
+    def blame_runs(self, commit_id, file, short):
+        # Runs [origin commit, length, 0, 0] of the file at commit_id, short maps full hashes to %h
         out = GitCommit2.execute_shell_command(f"""
-            cd {self.path} && git tag
+            cd {self.path} && git blame --porcelain {commit_id} -- {shlex.quote(file)}
             """)
-        tags = {}    
+        runs = []
+        origin = None
         for o in out:
-            if o:
-                longhash = GitCommit2.execute_shell_command(f"""
-                    cd {self.path} && git rev-list -n 1 {o}
-                    """)[0]
-                tags[o] = GitCommit2.execute_shell_command(f"""
-                    cd {self.path} && git rev-parse --short {longhash}
-                    """)[0]
-        return tags
-
+            if o.startswith('\t'):
+                if runs and runs[-1][0] == origin:
+                    runs[-1][1] += 1
+                else:
+                    runs.append([origin, 1, 0, 0])
+            elif GitCommit2.ptrn_blame.match(o):
+                h = o[:o.index(' ')]
+                origin = short.get(h, h[:7])
+        return runs
+
+    def get_short_hashes(self):
+        # {full hash: %h} of all commits, the ids used by track()
+        out = GitCommit2.execute_shell_command(f"""
+            cd {self.path} && git log --all --format='%H %h'
+            """)
+        return dict(o.split(' ') for o in out if o)
 
     def get_altered_lines(self, commit_id):
+        [altered_lines, renamed_files] = self.get_altered_ranges(commit_id)
+        return [GitDiff.expand(altered_lines), renamed_files]
+
+    def get_altered_ranges(self, commit_id):
         out = GitCommit2.execute_shell_command(f"""
             cd {self.path} && git show --unified=0 {commit_id} 2>&1
             """)
-        rename_file = {}
-        rename_file['from'] = ''
-        rename_file['to'] = ''
-        ptrn_rename_file = {}
-        ptrn_rename_file['from'] = re.compile(r"""		    
-            rename\sfrom\s(?P<file>.*)\s?
-            """, re.VERBOSE)
-        ptrn_rename_file['to'] = re.compile(r"""		    
-            rename\sto\s(?P<file>.*)\s?
-            """, re.VERBOSE)
-
-        current_file = {}
-        current_file['a'] = ''
-        current_file['b'] = ''
-        ptrn_current_file = {}
-        ptrn_current_file['a'] = re.compile(r"""		    
-            ---\sa/(?P<file>.*)\s?
-            """, re.VERBOSE)
-        ptrn_current_file['b'] = re.compile(r"""		    
-            \+\+\+\sb/(?P<file>.*)\s?
-            """, re.VERBOSE)
-
-        ptrn_chunk = re.compile(r"""		    
-            @@\s-(?P<m_line>\d+),?(?P<m_length>\d*)\s\+(?P<p_line>\d+),?(?P<p_length>\d*)\s@@.*
-            """, re.VERBOSE)
-
-        altered_lines = {}
-        renamed_files = []
-        for o in out:
-            # Rename files
-            for key in ptrn_rename_file:  
-                match = ptrn_rename_file[key].match(o)
-                if match is not None:
-                    rename_file[key] = match.group("file")
-                    if key == 'to':
-                        assert rename_file['from'], 'This should never happen!'
-                        renamed_files.append(rename_file.copy())
-                        rename_file['from'] = ''
-                        rename_file['to'] = ''
-                    break
-            else:
-                # Code changes
-                for key in ptrn_current_file:  
-                    match = ptrn_current_file[key].match(o)
-                    if match is not None:
-                        current_file[key] = match.group("file")
-                        if not current_file[key] in altered_lines:
-                            altered_lines[current_file[key]] = {}
-                            altered_lines[current_file[key]]['added'] = []
-                            altered_lines[current_file[key]]['deleted'] = []
-                        break
-                else:      
-                    match = ptrn_chunk.match(o)
-                    if match is not None:
-                        m_line = int(match.group("m_line"))
-                        m_length = match.group("m_length")
-                        if not m_length:
-                            m_length = 1
-                        else:
-                            m_length = int(m_length)
-                        p_line = int(match.group("p_line"))
-                        p_length = match.group("p_length")
-                        if not p_length:
-                            p_length = 1
-                        else:
-                            p_length = int(p_length)    
-
-                        deleted_lines = []    
-                        for i in range(0, m_length):
-                            deleted_lines.append(m_line+i)
-                        if deleted_lines:
-                            assert current_file['a'], 'This should never happen!'
-                            altered_lines[current_file['a']]['deleted'] += deleted_lines    
-
-                        added_lines = []
-                        for i in range(0, p_length):
-                            added_lines.append(p_line+i)
-                        if added_lines:
-                            assert current_file['b'], 'This should never happen!'
-                            altered_lines[current_file['b']]['added'] += added_lines
-        # Clean up
-        for file in altered_lines:
-            altered_lines[file]['added'] = GitCommit2.unique(altered_lines[file]['added'])
-            altered_lines[file]['added'].sort() 
-            altered_lines[file]['deleted'] = GitCommit2.unique(altered_lines[file]['deleted'])
-            altered_lines[file]['deleted'].sort(reverse=True)
-
-            # # Added before correction. This shifts the indexes!
-            # for idx, x in enumerate(altered_lines[file]['added']):
-            #     if idx == 0 or altered_lines[file]['added'][idx-1] + 1 == x:
-            #         continue
-            #     else:
-            #         altered_lines[file]['added'][idx] += idx
-      
+        [_, altered_lines, renamed_files] = next(GitDiff.parse(out))
         return [altered_lines, renamed_files]
-    
-    def track(self, commits, tags):
+
+    def iter_altered_lines(self):
+        # Altered line ranges of the whole history from a single 'git log -p' stream,
+        # in the same order as iter_commits()
+        out = GitLog.stream_shell_command(f"""
+            cd {self.path} && git log --all --topo-order --reverse -p --unified=0 --format='{GitLog.marker}%h'
+            """)
+        return GitDiff.parse(out, GitLog.marker)
+
+    @staticmethod
+    def next_altered_lines(diffs, commit_id):
+        for d in diffs:
+            if d[0] == commit_id:
+                return d
+        return None
+
+    def track(self, commits, tags, snapshots='all', store=None, checkpoint=1000):
+        # snapshots - checkpoint policy of the tracker history, see TrackerHistory
+        # store - TrackerStore to continue from, commits seen by the previous runs are skipped
+        #         and the state is saved every checkpoint commits
         tracker = {}
-        tracker_history = {}
-        blacklist = []
-        list_of_bad_files = []
+        timestamps = {}
+        blacklist = set()
+        list_of_bad_files = set()
         stats = []
-        release_commits = tags.values()
+        release_commits = set(tags.values())
+        # Lines store the clocks they were born at, survived commits/releases are the differences
+        commit_clock = 0
+        release_clock = 0
+        if store is not None:
+            state = store.load()
+            tracker = state['tracker']
+            timestamps = state['timestamps']
+            blacklist = state['blacklist']
+            list_of_bad_files = state['bad_files']
+            stats = state['stats']
+            [commit_clock, release_clock] = state['clock']
+            print(f"Continuing after {state['last_commit']} ({len(store)} commits seen)")
+        tracker_history = TrackerHistory(snapshots, tracker, timestamps)
+        dirty_files = set()
+        diffs = self.iter_altered_lines()
         for iter, c in enumerate(commits):
+            if store is not None and c['id'] in store:
+                continue
             print(iter)
             if c['patch-id'][0] in blacklist:
                 warnings.warn(f"Skipping {c['id']} - blacklisted!")
+                if store is not None:
+                    store.add(c['id'], c['timestamp'], False)
                 continue
-            blacklist.append(c['patch-id'][0])
+            blacklist.add(c['patch-id'][0])
             print(c['id'])
-            [altered_lines, renamed_files] = self.get_altered_lines(c['id'])
+            d = GitCommit2.next_altered_lines(diffs, c['id'])
+            if d is None:
+                warnings.warn(f"{c['id']} not found in the history stream!")
+                [altered_lines, renamed_files] = self.get_altered_ranges(c['id'])
+            else:
+                altered_lines = d[1]
+                renamed_files = d[2]
+            changed_files = set(altered_lines)
             # Rename files
             if renamed_files:
                 for rename_file in renamed_files:
                     if rename_file['from'] in tracker:
-                        tracker[rename_file['to']] = copy.deepcopy(tracker[rename_file['from']])
+                        tracker[rename_file['to']] = tracker[rename_file['from']].copy()
+                        changed_files.add(rename_file['to'])
                     else:
                         # This shall happen only for empty files
                         warnings.warn(f"Cannot rename {rename_file['from']} to {rename_file['to']}!")
@@ -214,54 +239,196 @@ class GitCommit2():
             for file, v in altered_lines.items():
                 print(file)
                 if not file in tracker:
-                    tracker[file] = {}
-                    tracker[file]['lines'] = ['N/A']
-                    tracker[file]['commitcounter'] = ['N/A']
-                    tracker[file]['releasecounter'] = ['N/A']
-                if  v['deleted']:   
-                    for l in v['deleted']:
-                        if l < len(tracker[file]['lines']) and not file in list_of_bad_files: 
-                            removed = tracker[file]['lines'].pop(l)
-                            commitcounter = tracker[file]['commitcounter'].pop(l)
-                            releasecounter = tracker[file]['releasecounter'].pop(l)
-                            timespan = c['timestamp'] - tracker_history[removed]['timestamp']
-                            print(f'Line {l} from commit {removed} removed! Lasted {timespan/3600/24} days! Survived {commitcounter} commits and {releasecounter} releases!')
-                            if not file in list_of_bad_files:
-                                # Gather statistics for plotting
+                    tracker[file] = LineTracker()
+                # Deleted ranges come in descending order so the line numbers stay valid
+                for start, length in v['deleted']:
+                    if start + length - 1 <= len(tracker[file]) and not file in list_of_bad_files:
+                        for [line, count, removed, born_commit, born_release] in reversed(tracker[file].delete(start, length)):
+                            commitcounter = commit_clock - born_commit
+                            releasecounter = release_clock - born_release
+                            timespan = c['timestamp'] - tracker_history.timestamps[removed]
+                            print(f'Lines {line}-{line + count - 1} from commit {removed} removed! Lasted {timespan/3600/24} days! Survived {commitcounter} commits and {releasecounter} releases!')
+                            # Gather statistics for plotting
+                            for l in range(line + count - 1, line - 1, -1):
                                 stats.append({
                                     'file': file,
-                                    'line': l, 
+                                    'line': l,
                                     'timeend': c['timestamp'],
-                                    'timestart': tracker_history[removed]['timestamp'],
-                                    'timespan': timespan
+                                    'timestart': tracker_history.timestamps[removed],
+                                    'timespan': timespan,
+                                    'commit': removed
                                 })
-                        else:
-                            # The git commit patch order is not right 
-                            warnings.warn(f"Cannot remove line {l} from {file} in commit {c['id']}!")
-                            if not file in list_of_bad_files:
-                                list_of_bad_files.append(file)
-                if v['added']:
-                    for l in v['added']:
-                        tracker[file]['lines'].insert(l, c['id'])
-                        tracker[file]['commitcounter'].insert(l, 0)
-                        tracker[file]['releasecounter'].insert(l, 0)
+                    else:
+                        # The git commit patch order is not right
+                        warnings.warn(f"Cannot remove lines {start}-{start + length - 1} from {file} in commit {c['id']}!")
+                        list_of_bad_files.add(file)
+                for start, length in v['added']:
+                    tracker[file].insert(start, length, c['id'], commit_clock, release_clock)
             # Increase the commit and release counters
             isReleaseCommit = False
             if c['id'] in release_commits:
                 isReleaseCommit = True
-            for f in tracker:
-                for i, v in enumerate(tracker[f]['commitcounter']):
-                    if i > 0:
-                        tracker[f]['commitcounter'][i] += 1
-                        if isReleaseCommit:
-                            tracker[f]['releasecounter'][i] += 1
-            if True or isReleaseCommit or iter == len(commits) - 1:
-                # Track the history
-                tracker_history[c['id']] = {}
-                tracker_history[c['id']]['timestamp'] = c['timestamp']
-                tracker_history[c['id']]['tracker'] = copy.deepcopy(tracker)
+            commit_clock += 1
+            if isReleaseCommit:
+                release_clock += 1
+            # Track the history
+            tracker_history.record(c['id'], c['timestamp'], [commit_clock, release_clock], tracker, changed_files, isReleaseCommit)
+            if store is not None:
+                store.add(c['id'], c['timestamp'], True)
+                dirty_files |= changed_files
+                if len(store.pending) >= checkpoint:
+                    store.checkpoint(tracker, dirty_files, list_of_bad_files, blacklist, stats, [commit_clock, release_clock])
+                    dirty_files = set()
+        if store is not None:
+            store.checkpoint(tracker, dirty_files, list_of_bad_files, blacklist, stats, [commit_clock, release_clock])
+        return [stats, tracker_history]
+
+    def track_parallel(self, commits, tags, snapshots='all', processes=None):
+        # track() with the line tracking spread over a process pool, same [stats, tracker_history].
+        # Files are independent except for renames, the files connected by renames form one group
+        # and the groups are split between the workers. The commits, clocks and diffs are read here
+        # in one pass, the stats and the history are merged back in the sequential order.
+        # snapshots=None skips the history (returned as None), the workers then send back the stats only.
+        blacklist = set()
+        release_commits = set(tags.values())
+        commit_clock = 0
+        release_clock = 0
+        events = []
+        groups = {}
+        diffs = self.iter_altered_lines()
+        for c in commits:
+            if c['patch-id'][0] in blacklist:
+                warnings.warn(f"Skipping {c['id']} - blacklisted!")
+                continue
+            blacklist.add(c['patch-id'][0])
+            d = GitCommit2.next_altered_lines(diffs, c['id'])
+            if d is None:
+                warnings.warn(f"{c['id']} not found in the history stream!")
+                [altered_lines, renamed_files] = self.get_altered_ranges(c['id'])
+            else:
+                altered_lines = d[1]
+                renamed_files = d[2]
+            isReleaseCommit = c['id'] in release_commits
+            events.append([c['id'], c['timestamp'], commit_clock, release_clock, isReleaseCommit, altered_lines, renamed_files])
+            for file in altered_lines:
+                GitCommit2.union(groups, file, file)
+            for rename_file in renamed_files:
+                GitCommit2.union(groups, rename_file['from'], rename_file['to'])
+            commit_clock += 1
+            if isReleaseCommit:
+                release_clock += 1
+
+        # Work per group is the number of altered lines, the largest groups go first to the least loaded worker
+        processes = processes or os.cpu_count() or 1
+        work = {GitCommit2.find(groups, file): 0 for file in groups}
+        for e in events:
+            for file, v in e[5].items():
+                root = GitCommit2.find(groups, file)
+                work[root] = work.get(root, 0) + 1 + sum(length for start, length in v['added'] + v['deleted'])
+        load = [0]*processes
+        partition = {}
+        for root in sorted(work, key=lambda x: -work[x]):
+            k = load.index(min(load))
+            load[k] += work[root]
+            partition[root] = k
+        jobs = [[] for k in range(processes)]
+        for seq, [commit_id, timestamp, commit_clock, release_clock, isReleaseCommit, altered_lines, renamed_files] in enumerate(events):
+            parts = {}
+            for pos, [file, v] in enumerate(altered_lines.items()):
+                parts.setdefault(partition[GitCommit2.find(groups, file)], [[], []])[0].append([pos, file, v])
+            for rename_file in renamed_files:
+                k = partition.get(GitCommit2.find(groups, rename_file['from']))
+                if k is not None:
+                    parts.setdefault(k, [[], []])[1].append(rename_file)
+            for k, [altered, renames] in parts.items():
+                jobs[k].append([seq, commit_id, timestamp, commit_clock, release_clock, altered, renames])
+        jobs = [[job, snapshots is not None] for job in jobs if job]
+
+        if processes == 1 or len(jobs) <= 1:
+            results = [GitCommit2.track_partition(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(min(processes, len(jobs))) as pool:
+                results = list(pool.map(GitCommit2.track_partition, jobs))
+
+        # Every (commit, file) comes from one worker, merging by the position gives the sequential order
+        stats = [x[2] for x in heapq.merge(*[r[0] for r in results], key=lambda x: (x[0], x[1]))]
+        if snapshots is None:
+            return [stats, None]
+        deltas = {}
+        for r in results:
+            for seq, delta in r[1]:
+                deltas.setdefault(seq, {}).update(delta)
+        tracker = {}
+        tracker_history = TrackerHistory(snapshots)
+        for seq, [commit_id, timestamp, commit_clock, release_clock, isReleaseCommit, altered_lines, renamed_files] in enumerate(events):
+            delta = deltas.get(seq, {})
+            for file, root in delta.items():
+                tracker[file] = LineTracker(root)
+            clock = [commit_clock + 1, release_clock + 1 if isReleaseCommit else release_clock]
+            tracker_history.record(commit_id, timestamp, clock, tracker, delta.keys(), isReleaseCommit)
         return [stats, tracker_history]
 
+    @staticmethod
+    def track_partition(job):
+        # The tracking loop of track() over a group of files, the stats come with their
+        # (commit sequence, file position) for the merge and the file roots after every commit
+        [events, history] = job
+        tracker = {}
+        timestamps = {}
+        list_of_bad_files = set()
+        stats = []
+        deltas = []
+        for [seq, commit_id, timestamp, commit_clock, release_clock, altered, renamed_files] in events:
+            timestamps[commit_id] = timestamp
+            changed_files = set(file for pos, file, v in altered)
+            for rename_file in renamed_files:
+                if rename_file['from'] in tracker:
+                    tracker[rename_file['to']] = tracker[rename_file['from']].copy()
+                    changed_files.add(rename_file['to'])
+                else:
+                    warnings.warn(f"Cannot rename {rename_file['from']} to {rename_file['to']}!")
+            for pos, file, v in altered:
+                if not file in tracker:
+                    tracker[file] = LineTracker()
+                for start, length in v['deleted']:
+                    if start + length - 1 <= len(tracker[file]) and not file in list_of_bad_files:
+                        for [line, count, removed, born_commit, born_release] in reversed(tracker[file].delete(start, length)):
+                            timespan = timestamp - timestamps[removed]
+                            for l in range(line + count - 1, line - 1, -1):
+                                stats.append((seq, pos, {
+                                    'file': file,
+                                    'line': l,
+                                    'timeend': timestamp,
+                                    'timestart': timestamps[removed],
+                                    'timespan': timespan,
+                                    'commit': removed
+                                }))
+                    else:
+                        warnings.warn(f"Cannot remove lines {start}-{start + length - 1} from {file} in commit {commit_id}!")
+                        list_of_bad_files.add(file)
+                for start, length in v['added']:
+                    tracker[file].insert(start, length, commit_id, commit_clock, release_clock)
+            if history:
+                deltas.append((seq, {f: tracker[f].root for f in changed_files}))
+        return [stats, deltas]
+
+    @staticmethod
+    def find(groups, x):
+        # Union-find with path halving, groups maps a file to its parent
+        while groups[x] != x:
+            groups[x] = groups[groups[x]]
+            x = groups[x]
+        return x
+
+    @staticmethod
+    def union(groups, a, b):
+        groups.setdefault(a, a)
+        groups.setdefault(b, b)
+        ra = GitCommit2.find(groups, a)
+        rb = GitCommit2.find(groups, b)
+        if ra != rb:
+            groups[rb] = ra
+
     @staticmethod
     def execute_shell_command(cmd):
         # Shell executes given command
@@ -281,6 +448,9 @@ class GitCommit2():
         return list(set(a))       
 
 class GitAnalysis():
+    # Series shared with the sweep() worker processes
+    sweep_series = None
+
     def __init__(self, name):
         print('GIT ANALYSIS')
         print('┏━━━━━')
@@ -288,91 +458,165 @@ class GitAnalysis():
             self.name = name
         else:
             self.name = 'output.csv'
-        self.commits = []
+        self.commits = CommitTable.from_rows([])
 
     def __del__(self):
         print('┻')
 
-    def import_csv(self, fn):
-        with open(fn, 'r') as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=",")
-            header = next(csv_reader)
-            if not GitCommit.get_fields() == ",".join(header):
-                raise Exception(f'CSV fields in {fn} do not match! Please check the CSV file!\n{GitCommit.get_fields()}\n{",".join(header)}')
-            line_count = 0
-            for row in csv_reader:
-                self.commits.append(GitCommit(row))
-                line_count += 1
-            print(f'┣ loaded {line_count} commits from {fn}')
-
-    def plot(self, min_dt, relative_band, attr):
-        t = []
-        y = []
-        tags = [];
-        for c in self.commits:
-            t.append(c.timestamp)
-            y.append(getattr(c, attr))
-            tags.append(c.values["tag"])
-
-        t = np.array(t)
-        y = np.array(y)
-        idx = np.argsort(t)
-        t = t[idx]
-        y = y[idx]
+    def import_csv(self, fn, cache=True):
+        # The parsed table is cached next to the CSV and memory mapped while the CSV is unchanged
+        table = Cache.load_table(fn) if cache else None
+        if table is not None:
+            print(f'┣ loaded {len(table)} commits from {Cache.path(fn)}')
+        else:
+            table = CommitTable.from_csv(fn)
+            if cache:
+                Cache.save_table(table, fn)
+            print(f'┣ loaded {len(table)} commits from {fn}')
+        self.add_commits(table)
+
+    def import_git(self, path):
+        table = CommitTable.from_rows(GitLog(path).rows())
+        self.add_commits(table)
+        print(f'┣ loaded {len(table)} commits from {path}')
+
+    def add_commits(self, table):
+        if len(self.commits) == 0:
+            self.commits = table
+        else:
+            self.commits = CommitTable.concatenate([self.commits, table])
+
+    def series(self, attr):
+        # Days since the first commit, cumulative sum of attr and tags sorted by time
+        idx = np.argsort(self.commits.timestamp)
+        t = self.commits.timestamp[idx]
+        y = getattr(self.commits, attr)[idx]
+        tags = self.commits.tag[idx].tolist()
         t = t - t[0]
         y = np.cumsum(y)
         y = y - y[0]
+        return [t, y, tags]
 
+    def plot(self, min_dt, relative_band, attr, output=None):
+        # output - PNG/SVG file to write the figure to instead of showing it
+        [t, y, tags] = self.series(attr)
+
+        matplt = Render.pyplot()
         [fig, ax] = matplt.subplots()
-        ax.plot(t, y, linewidth=2.0)
+        Render.line(ax, t, y, linewidth=2.0)
         matplt.grid(True)
 
         [is_at_steady_state, idx_ranges] = GitAnalysis.findSteadyState(t, y, min_dt, relative_band)
-        
-        stable_release = False
-        stable_release_region = False
-        stable_releases = []
+        stable_releases = GitAnalysis.findStableReleases(tags, idx_ranges)
+
+        is_stable = set(stable_releases.tolist())
         for i, txt in enumerate(tags):
-            for rng in idx_ranges:
-                if i >= rng[0] and i <= rng[1]:
-                    stable_release_region = True
-                    break
-            else:
-                stable_release_region = False
-                if stable_release:
-                    stable_release = False
-                    matplt.setp(last_annotation,color='red')
-                    matplt.setp(last_axvline,color='red')
-                    stable_releases.append(last_txt)
             if txt:
-                last_annotation = ax.annotate(txt, (t[i], 0.95*y[i]), color='gray')
-                last_axvline = ax.axvline(t[i], linestyle=':', color='gray', linewidth=0.5)
-                last_txt = txt
-                if stable_release_region:
-                    stable_release = True
-                
-        else:
-            if stable_release:
-                matplt.setp(last_annotation,color='red')
-                matplt.setp(last_axvline,color='red')
-                stable_releases.append(last_txt)
+                color = 'red' if i in is_stable else 'gray'
+                ax.annotate(txt, (t[i], 0.95*y[i]), color=color)
+                ax.axvline(t[i], linestyle=':', color=color, linewidth=0.5)
 
-        ax.plot(t[is_at_steady_state], y[is_at_steady_state], 'ro')
+        Render.line(ax, t[is_at_steady_state], y[is_at_steady_state], 'ro')
         for rng in idx_ranges:
             ax.axvspan(t[rng[0]], t[rng[1]], color='red', alpha=0.2)
         
-        dt_start = self.commits[0].values["date"]
+        dt_start = self.commits.date[0]
         matplt.title(f'Git Commit Analysis: {self.name}')
         ax.set_xlabel(f'Days since {dt_start}')
         ax.set_ylabel(f'Cummulative sum of {attr}')
-        matplt.show()
+        Render.finish(fig, output)
 
         print('Stable releases')
-        for stable_release in stable_releases:
-            print(f'{stable_release}')
+        for i in stable_releases:
+            print(f'{tags[i]}')
+
+    @staticmethod
+    def findStableReleases(tags, idx_ranges):
+        # Indices of the stable releases: the last tag inside each steady-state region
+        # (touching ranges count as one region)
+        n = len(tags)
+        in_region = np.full(n, False)
+        for rng in idx_ranges:
+            in_region[rng[0]:rng[1]+1] = True
+        is_tag = np.asarray(tags, dtype=str) != '' if n else np.full(0, False)
+        region = np.cumsum(in_region & ~np.concatenate(([False], in_region[:-1])))
+        idx = np.flatnonzero(is_tag & in_region)
+        is_last = np.append(region[idx][1:] != region[idx][:-1], True) if idx.size else np.full(0, False)
+        return idx[is_last]
+
+    def sweep(self, min_dts, relative_bands, attrs=('lines_altered', 'lines_weighted'), processes=None):
+        # Stable releases for every (attr, min_dt, relative_band), the series are computed once
+        # and handed to the worker processes when they start
+        series = {attr: self.series(attr) for attr in attrs}
+        params = [(attr, min_dt, relative_band) for attr in attrs for min_dt in min_dts for relative_band in relative_bands]
+        if processes == 1:
+            GitAnalysis.sweep_init(series)
+            results = [GitAnalysis.sweep_one(x) for x in params]
+        else:
+            with ProcessPoolExecutor(processes, initializer=GitAnalysis.sweep_init, initargs=(series,)) as pool:
+                results = list(pool.map(GitAnalysis.sweep_one, params, chunksize=max(1, len(params) // (8*(processes or os.cpu_count() or 1)))))
+        return results
+
+    @staticmethod
+    def sweep_init(series):
+        GitAnalysis.sweep_series = series
+
+    @staticmethod
+    def sweep_one(param):
+        [attr, min_dt, relative_band] = param
+        [t, y, tags] = GitAnalysis.sweep_series[attr]
+        [is_at_steady_state, idx_ranges] = GitAnalysis.findSteadyState(t, y, min_dt, relative_band)
+        stable_releases = GitAnalysis.findStableReleases(tags, idx_ranges)
+        return {
+            'attr': attr,
+            'min_dt': min_dt,
+            'relative_band': relative_band,
+            'steady_states': len(idx_ranges),
+            'steady_days': float(sum(t[rng[1]] - t[rng[0]] for rng in idx_ranges)),
+            'stable_releases': [tags[i] for i in stable_releases]
+        }
 
     @staticmethod
     def findSteadyState(t, sig, min_dt, relative_band):
+        # For a non-decreasing signal (cumulative sums) the band around sig[i] is left at the first
+        # index with sig >= sig[i] + band, all of them are found by one binary search pass
+        n = t.size
+        if n > 1 and np.any(np.diff(sig) < 0):
+            return GitAnalysis.findSteadyStateScan(t, sig, min_dt, relative_band)
+        idx = np.arange(n)
+        band = relative_band * sig
+        idx_exit = np.searchsorted(sig, sig + band, side='left')
+        # Rounding of sig + band, settle on the exact condition sig[k] - sig[i] < band
+        while True:
+            back = (idx_exit > idx) & ~(sig[np.maximum(idx_exit - 1, 0)] - sig < band)
+            if not back.any():
+                break
+            idx_exit[back] -= 1
+        while True:
+            forward = (idx_exit < n) & (sig[np.minimum(idx_exit, n - 1)] - sig < band)
+            if not forward.any():
+                break
+            idx_exit[forward] += 1
+
+        is_sig_at_steady_state = np.full(n, False)
+        idx_ranges = []
+        idx_exit = idx_exit.tolist()
+        idx_start = 0
+        while idx_start < n:
+            if idx_exit[idx_start] - idx_start <= 1:
+                idx_start = idx_start + 1
+                continue
+            idx_last_in_band = idx_exit[idx_start] - 1
+            dt = t[idx_last_in_band] - t[idx_start]
+            if dt > min_dt:
+                is_sig_at_steady_state[idx_start:idx_last_in_band+1] = True
+                idx_ranges.append([idx_start, idx_last_in_band])
+            idx_start = idx_last_in_band + 1
+        return [is_sig_at_steady_state, idx_ranges]
+
+    @staticmethod
+    def findSteadyStateScan(t, sig, min_dt, relative_band):
+        # Any signal, rescans the tail for every start
         n = t.size
         is_sig_at_steady_state = np.full(n, False)
         idx_ranges = []
@@ -397,68 +641,134 @@ class GitAnalysis():
             idx_start = idx_last_in_band + 1
         return [is_sig_at_steady_state, idx_ranges]
 
+    @staticmethod
+    def survival_quantiles(stats, step=30, quantiles=(0.5,), chunk=4096):
+        # Quantiles (linear interpolation, 0.5 is statistics.median) of the timespans of the lines
+        # alive (timestart <= t <= timeend, timespan >= 0) every step days from the first timestart.
+        # stats as gathered by GitCommit2.track() or as columns (Cache.load_stats()).
+        # Returns [t, q] in days, q[i, j] is quantiles[j] at t[i], times without alive lines are left out.
+        # The lines are sorted by timespan and cut into ~sqrt(n) blocks, the alive lines per block
+        # are counted by binary search for all t at once and only one block is scanned per quantile.
+        if not isinstance(stats, dict):
+            stats = {x: [s[x] for s in stats] for x in ('timestart', 'timeend', 'timespan')}
+        start = np.asarray(stats['timestart'], dtype=float)
+        end = np.asarray(stats['timeend'], dtype=float)
+        span = np.asarray(stats['timespan'], dtype=float)
+        quantiles = np.atleast_1d(np.asarray(quantiles, dtype=float))
+        if start.size == 0:
+            return [np.zeros(0), np.zeros((0, quantiles.size))]
+        tx = np.arange(np.floor(start.min()), np.floor(end.max()), step*24*3600)
+
+        valid = span >= 0
+        order = np.argsort(span[valid], kind='stable')
+        start = start[valid][order]
+        end = end[valid][order]
+        span = span[valid][order]
+        n = span.size
+        size = max(1, int(np.sqrt(n)))
+        counts = np.zeros((tx.size, (n + size - 1) // size), dtype=np.int64)
+        for b, i in enumerate(range(0, n, size)):
+            counts[:, b] = np.searchsorted(np.sort(start[i:i+size]), tx, side='right') \
+                - np.searchsorted(np.sort(end[i:i+size]), tx, side='left')
+        cum = np.cumsum(counts, axis=1)
+        alive = cum[:, -1] if n else np.zeros(tx.size, dtype=np.int64)
+        has_alive = alive > 0
+        tx = tx[has_alive]
+        cum = cum[has_alive]
+        alive = alive[has_alive]
+
+        q = np.empty((tx.size, quantiles.size))
+        for c in range(0, tx.size, chunk):
+            t_c = tx[c:c+chunk]
+            cum_c = cum[c:c+chunk]
+            pos = quantiles[None, :] * (alive[c:c+chunk, None] - 1)
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.ceil(pos).astype(np.int64)
+            for j in range(quantiles.size):
+                v_lo = GitAnalysis.kth_alive(start, end, span, size, t_c, cum_c, lo[:, j])
+                if np.array_equal(lo[:, j], hi[:, j]):
+                    v_hi = v_lo
+                else:
+                    v_hi = GitAnalysis.kth_alive(start, end, span, size, t_c, cum_c, hi[:, j])
+                q[c:c+chunk, j] = v_lo + (v_hi - v_lo)*(pos[:, j] - lo[:, j])
+        return [tx/24/3600, q/24/3600]
+
+    @staticmethod
+    def kth_alive(start, end, span, size, t, cum, k):
+        # span of the k[i]-th (0-based, by span) line alive at t[i], cum[i] are the cumulative
+        # alive counts of the blocks of size lines. Finds the block, then scans only that block.
+        n = span.size
+        rows = np.arange(t.size)
+        b = np.argmax(cum > k[:, None], axis=1)
+        r = k - np.where(b > 0, cum[rows, b - 1], 0)
+        idx = b[:, None]*size + np.arange(size)
+        in_range = idx < n
+        idx = np.minimum(idx, n - 1)
+        is_alive = in_range & (start[idx] <= t[:, None]) & (end[idx] >= t[:, None])
+        j = np.argmax(np.cumsum(is_alive, axis=1) > r[:, None], axis=1)
+        return span[idx[rows, j]]
+
     @staticmethod
     def weibull(x, alfa, k):
-        if x < 0:
-            return 0
-        else:
-            return (k / alfa) * (x / alfa)**(k - 1) * np.exp(-(x / alfa)**k)
+        # Scalars or arrays, 0 for x < 0
+        return WeibullKernel(alfa, k).pdf(x)
 
     @staticmethod
     def exponential(x, alfa):
-        if x < 0:
-            return 0
-        else:
-            return np.exp(-1.0*alfa*x)
+        return ExponentialKernel(alfa)(x)
 
-    def plot2(self, attr):
+    @staticmethod
+    def fault_score(t, y, alfa):
+        # p[i] = y[i] * sum of exponential(t[j] - t[i], alfa) over j >= i for sorted t.
+        # The sum is built in one backward pass: s[i] = 1 + exp(-alfa*(t[i+1] - t[i]))*s[i+1]
+        n = t.size
+        decay = np.exp(-1.0*alfa*np.diff(t)).tolist()
+        s = [0.0]*n
+        carry = 0.0
+        for i in range(n - 1, -1, -1):
+            carry = 1.0 + carry*decay[i] if i < n - 1 else 1.0
+            s[i] = carry
+        return y*np.array(s)
+
+    def plot2(self, attr, kernel=None, dt=1.0, output=None):
+        # kernel - None for the exponential fault score below, otherwise a Kernel
+        #          whose convolution with the commit sizes on a dt days grid is plotted
+        # output - PNG/SVG file to write the figure to instead of showing it
         # Parameter - after 180 days, 5% bugs are left
         alfa = -1.0 * np.log(0.05) / 30
-        
-        t = []
-        y = []
-        tags = [];
-        for c in self.commits:
-            t.append(c.timestamp)
-            y.append(getattr(c, attr))
-            tags.append(c.values["tag"])
-
-        t = np.array(t)
-        y = np.array(y)
-        idx = np.argsort(t)
-        t = t[idx]
-        y = y[idx]
-        t = t - t[0]
-        y = np.cumsum(y)
-        y = y - y[0]
-        p = np.full(t.size, 0.0)
-        for i, t1 in enumerate(t):
-            for t2 in t[i:]:
-                p[i] = p[i] + y[i]*GitAnalysis.exponential(t2 - t1, alfa)
+
+        [t, y, tags] = self.series(attr)
+        if kernel is None:
+            p = GitAnalysis.fault_score(t, y, alfa)
+        else:
+            [grid, faults] = kernel.convolve(t, np.diff(y, prepend=0.0), dt)
+            p = np.interp(t, grid, faults)
 
         # p_norm = (p-np.min(p))/(np.max(p)-np.min(p))
         p_norm = p
 
+        matplt = Render.pyplot()
         [fig, axs] = matplt.subplots(2, sharex=True)
-        axs[0].plot(t, y, linewidth=1.0)
+        Render.line(axs[0], t, y, linewidth=1.0)
         matplt.grid(True)
-        axs[1].plot(t, p_norm, linewidth=1.0)
+        Render.line(axs[1], t, p_norm, linewidth=1.0)
         matplt.grid(True)
         
         for i, txt in enumerate(tags):
             if txt:
                 for ax in axs:
-                    last_annotation = ax.annotate(txt, (t[i], 0), color='gray')
-                    last_axvline = ax.axvline(t[i], linestyle=':', color='gray', linewidth=0.5)
-                axs[0].plot(t[i], y[i], 'x', color = 'red')
-                axs[1].plot(t[i], p_norm[i], 'x', color = 'red')
-                last_txt = txt
+                    ax.annotate(txt, (t[i], 0), color='gray')
+                    ax.axvline(t[i], linestyle=':', color='gray', linewidth=0.5)
+        # All the tag markers as one line each
+        is_tag = np.asarray(tags, dtype=str) != ''
+        axs[0].plot(t[is_tag], y[is_tag], 'x', color = 'red')
+        axs[1].plot(t[is_tag], p_norm[is_tag], 'x', color = 'red')
 
         fig.suptitle(f'Git Commit Analysis: {self.name}')        
-        dt_start = self.commits[0].values["date"]
+        dt_start = self.commits.date[0]
         for ax in axs:
             ax.set_xlabel(f'Days since {dt_start}')
         axs[0].set_ylabel(f'Cummulative sum of {attr}')
         axs[1].set_ylabel(f'Cummulative normalized fault score')
-        matplt.show()
+        Render.finish(fig, output)
         
@@ -0,0 +1,84 @@
+import re
+
+
+class GitDiff():
+    # Altered line ranges parsed from 'git show --unified=0' or a whole 'git log -p --unified=0' stream
+    ptrn_chunk = re.compile(r"@@ -(?P<m_line>\d+),?(?P<m_length>\d*) \+(?P<p_line>\d+),?(?P<p_length>\d*) @@")
+
+    @staticmethod
+    def parse(lines, marker=None):
+        # Yields [commit_id, altered_lines, renamed_files] for every commit starting with a marker line,
+        # altered_lines[file]['added'|'deleted'] are lists of (first line, number of lines) ranges
+        commit_id = None
+        altered_lines = {}
+        renamed_files = []
+        rename_from = ''
+        current_file = {'a': '', 'b': ''}
+        remaining = 0
+        for o in lines:
+            if remaining > 0 and o[:1] in ('+', '-'):
+                # Hunk content, never mistaken for a header
+                remaining -= 1
+                continue
+            if marker is not None and o.startswith(marker):
+                if commit_id is not None:
+                    yield [commit_id, GitDiff.normalize(altered_lines), renamed_files]
+                commit_id = o[len(marker):]
+                altered_lines = {}
+                renamed_files = []
+                rename_from = ''
+                current_file = {'a': '', 'b': ''}
+                remaining = 0
+            elif o.startswith('@@ '):
+                match = GitDiff.ptrn_chunk.match(o)
+                if match is None:
+                    continue
+                m_length = int(match.group('m_length') or 1)
+                p_length = int(match.group('p_length') or 1)
+                remaining = m_length + p_length
+                if m_length:
+                    assert current_file['a'], 'This should never happen!'
+                    altered_lines[current_file['a']]['deleted'].append((int(match.group('m_line')), m_length))
+                if p_length:
+                    assert current_file['b'], 'This should never happen!'
+                    altered_lines[current_file['b']]['added'].append((int(match.group('p_line')), p_length))
+            elif o.startswith('--- a/') or o.startswith('+++ b/'):
+                key = 'a' if o[0] == '-' else 'b'
+                current_file[key] = o[6:]
+                if not current_file[key] in altered_lines:
+                    altered_lines[current_file[key]] = {'added': [], 'deleted': []}
+            elif o.startswith('rename from '):
+                rename_from = o[12:]
+            elif o.startswith('rename to '):
+                assert rename_from, 'This should never happen!'
+                renamed_files.append({'from': rename_from, 'to': o[10:]})
+                rename_from = ''
+        if marker is None or commit_id is not None:
+            yield [commit_id, GitDiff.normalize(altered_lines), renamed_files]
+
+    @staticmethod
+    def normalize(altered_lines):
+        # Merge overlapping ranges, added lines ascending and deleted lines descending
+        for file in altered_lines:
+            for key in ('added', 'deleted'):
+                ranges = []
+                for start, length in sorted(altered_lines[file][key]):
+                    if ranges and start <= ranges[-1][0] + ranges[-1][1]:
+                        end = max(ranges[-1][0] + ranges[-1][1], start + length)
+                        ranges[-1] = (ranges[-1][0], end - ranges[-1][0])
+                    else:
+                        ranges.append((start, length))
+                if key == 'deleted':
+                    ranges.reverse()
+                altered_lines[file][key] = ranges
+        return altered_lines
+
+    @staticmethod
+    def expand(altered_lines):
+        # Ranges to the lists of every single line number
+        expanded = {}
+        for file, v in altered_lines.items():
+            expanded[file] = {}
+            expanded[file]['added'] = [l for start, length in v['added'] for l in range(start, start + length)]
+            expanded[file]['deleted'] = [l for start, length in v['deleted'] for l in reversed(range(start, start + length))]
+        return expanded
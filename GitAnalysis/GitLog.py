@@ -0,0 +1,59 @@
+import csv
+import subprocess
+
+from .GitTags import GitTags
+
+
+class GitLog():
+    # Single pass over 'git log --numstat' producing rows in GitCommit.fields order
+    fields = ['commit_id','author','date','changed_files','lines_added','lines_deleted','tag']
+    separator = '\x1f'
+    marker = '\x01'
+
+    def __init__(self, path, tags=None):
+        self.path = path
+        self.tags = tags if tags is not None else GitTags(path)
+
+    def rows(self):
+        row = None
+        for o in GitLog.stream_shell_command(f"""
+            cd {self.path} && git log --all --numstat --reverse --date=local --date=format-local:'%Y-%m-%d %H:%M:%S' --pretty=format:'{GitLog.marker}%h{GitLog.separator}%an{GitLog.separator}%ad'
+            """):
+            if o.startswith(GitLog.marker):
+                if row is not None:
+                    yield row
+                v = o[1:].split(GitLog.separator)
+                row = [v[0], v[1], v[2], 0, 0, 0, self.tags.lookup(v[0]) or '']
+            elif o and row is not None:
+                # <added>\t<deleted>\t<file>, binary files report '-'
+                v = o.split('\t', 2)
+                row[3] += 1
+                if v[0] != '-':
+                    row[4] += int(v[0])
+                if v[1] != '-':
+                    row[5] += int(v[1])
+        if row is not None:
+            yield row
+
+    def export_csv(self, fn):
+        line_count = 0
+        with open(fn, 'w', newline='') as csv_file:
+            csv_writer = csv.writer(csv_file, delimiter=",")
+            csv_writer.writerow(GitLog.fields)
+            for row in self.rows():
+                csv_writer.writerow(row)
+                line_count += 1
+        return line_count
+
+    @staticmethod
+    def stream_shell_command(cmd):
+        # Shell executes given command, output is yielded line by line as it comes
+        p = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE)
+        try:
+            for line in p.stdout:
+                yield line.decode('UTF-8','ignore').rstrip('\n')
+        finally:
+            p.stdout.close()
+            if p.poll() is None:
+                p.kill()
+            p.wait()
@@ -0,0 +1,58 @@
+import bisect
+import subprocess
+
+
+class GitTags():
+    # All tag -> commit mappings resolved by a single 'git for-each-ref' call
+    def __init__(self, path):
+        self.path = path
+        self.tags = {}
+        commits = {}
+        for o in GitTags.execute_shell_command(f"""
+            cd {self.path} && git for-each-ref --format='%(refname:strip=2)%09%(objecttype)%09%(objectname)%09%(objectname:short)%09%(*objecttype)%09%(*objectname)%09%(*objectname:short)' refs/tags
+            """):
+            v = o.split('\t')
+            if len(v) != 7:
+                continue
+            if v[1] == 'commit':
+                longhash, shorthash = v[2], v[3]
+            elif v[4] == 'commit':
+                # Annotated tag
+                longhash, shorthash = v[5], v[6]
+            else:
+                # Tag of a tag (or of a tree/blob) - resolve the rare case separately
+                longhash = GitTags.execute_shell_command(f"""
+                    cd {self.path} && git rev-list -n 1 {v[0]} 2>/dev/null
+                    """)[0]
+                if not longhash:
+                    continue
+                shorthash = GitTags.execute_shell_command(f"""
+                    cd {self.path} && git rev-parse --short {longhash}
+                    """)[0]
+            self.tags[v[0]] = shorthash
+            # Same as 'git tag' order, the last tag of a commit wins
+            commits[longhash] = v[0]
+        # Prefix index - abbreviated hashes are looked up by bisection
+        self.hashes = sorted(commits)
+        self.names = [commits[h] for h in self.hashes]
+
+    def __len__(self):
+        return len(self.tags)
+
+    def lookup(self, commit_id):
+        # Tag of a commit given by full or abbreviated hash, None if not tagged
+        idx = bisect.bisect_left(self.hashes, commit_id)
+        if idx == len(self.hashes) or not self.hashes[idx].startswith(commit_id):
+            return None
+        if idx + 1 < len(self.hashes) and self.hashes[idx + 1].startswith(commit_id):
+            # Ambiguous abbreviation
+            return None
+        return self.names[idx]
+
+    @staticmethod
+    def execute_shell_command(cmd):
+        try:
+            r = subprocess.check_output(cmd, shell=True)
+        except subprocess.CalledProcessError as e:
+            r = e.output
+        return r.decode('UTF-8','ignore').split("\n")
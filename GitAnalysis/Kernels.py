@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class Kernel():
+    # Fraction of the faults introduced by a commit that are still present x days later,
+    # evaluated on whole arrays and 0 for x < 0
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        return np.where(x < 0, 0.0, self.survival(np.maximum(x, 0.0)))[()]
+
+    def survival(self, x):
+        raise NotImplementedError
+
+    def convolve(self, t, sizes, dt=1.0):
+        # Residual faults on a regular grid of dt days: sum of sizes[i]*kernel(g - t[i]) over t[i] <= g.
+        # Returns [grid, faults], the commit sizes are binned into the grid first.
+        g = np.floor((t - t[0]) / dt).astype(int)
+        binned = np.bincount(g, weights=sizes)
+        grid = np.arange(binned.size) * dt
+        faults = Kernel.fftconvolve(binned, self(grid))[:binned.size]
+        return [grid + t[0], faults]
+
+    @staticmethod
+    def fftconvolve(a, b):
+        n = a.size + b.size - 1
+        if min(a.size, b.size) < 500:
+            return np.convolve(a, b)
+        nfft = 1 << (n - 1).bit_length()
+        return np.fft.irfft(np.fft.rfft(a, nfft) * np.fft.rfft(b, nfft), nfft)[:n]
+
+
+class ExponentialKernel(Kernel):
+    def __init__(self, alfa):
+        self.alfa = alfa
+
+    def survival(self, x):
+        return np.exp(-1.0*self.alfa*x)
+
+
+class WeibullKernel(Kernel):
+    # alpha (scale, days) and beta (shape) as fitted by CraftBench.research_releases (do_research
+    # fits seconds, its alpha / 86400 is in days), beta = 1 is the exponential kernel with alfa = 1/alpha
+    def __init__(self, alpha, beta):
+        self.alpha = alpha
+        self.beta = beta
+
+    def survival(self, x):
+        return np.exp(-(x / self.alpha)**self.beta)
+
+    def pdf(self, x):
+        x = np.asarray(x, dtype=float)
+        xp = np.maximum(x, 0.0)
+        k = self.beta
+        return np.where(x < 0, 0.0, (k / self.alpha) * (xp / self.alpha)**(k - 1) * np.exp(-(xp / self.alpha)**k))[()]
+
+
+class EmpiricalKernel(Kernel):
+    # Survival curve given by points (x days, fraction left), linearly interpolated
+    def __init__(self, x, s):
+        self.x = np.asarray(x, dtype=float)
+        self.s = np.asarray(s, dtype=float)
+
+    def survival(self, x):
+        return np.interp(x, self.x, self.s, left=1.0, right=self.s[-1])
+
+    @staticmethod
+    def from_samples(samples):
+        # Empirical survival function of the fault discovery times (days)
+        x = np.sort(np.asarray(samples, dtype=float))
+        s = 1.0 - np.arange(1, x.size + 1) / x.size
+        return EmpiricalKernel(np.concatenate(([0.0], x)), np.concatenate(([1.0], s)))
@@ -0,0 +1,141 @@
+import random
+
+
+class LineRun():
+    # Consecutive lines of a file coming from the same commit, node of the LineTracker treap.
+    # The commit and release clocks at which the lines were born replace per-line counters.
+    __slots__ = ('commit', 'born_commit', 'born_release', 'length', 'size', 'priority', 'left', 'right')
+
+    def __init__(self, commit, length, born_commit=0, born_release=0, priority=None):
+        self.commit = commit
+        self.born_commit = born_commit
+        self.born_release = born_release
+        self.length = length
+        self.size = length
+        self.priority = random.random() if priority is None else priority
+        self.left = None
+        self.right = None
+
+
+class LineTracker():
+    # Lines of one file as runs in an implicit treap keyed by line position,
+    # deleting or inserting a range of lines is O(log n) in the number of runs.
+    # Nodes are never modified once built (path copying), so copies and snapshots
+    # of a file share the root and cost O(1).
+    # Line numbers are 1-based like in the diff hunks.
+    def __init__(self, root=None):
+        self.root = root
+
+    def copy(self):
+        return LineTracker(self.root)
+
+    def __len__(self):
+        return LineTracker.size(self.root)
+
+    def insert(self, start, length, commit, born_commit=0, born_release=0):
+        # Lines past the end of file are appended
+        [left, right] = LineTracker.split(self.root, min(start - 1, len(self)))
+        run = LineRun(commit, length, born_commit, born_release)
+        self.root = LineTracker.merge(LineTracker.merge(left, run), right)
+
+    def delete(self, start, length):
+        # Returns removed runs as [first line, number of lines, commit, born_commit, born_release]
+        [left, right] = LineTracker.split(self.root, start - 1)
+        [removed, right] = LineTracker.split(right, length)
+        self.root = LineTracker.merge(left, right)
+        runs = []
+        line = start
+        for run in LineTracker.iterate(removed):
+            runs.append([line, run.length, run.commit, run.born_commit, run.born_release])
+            line += run.length
+        return runs
+
+    def runs(self):
+        return LineTracker.iterate(self.root)
+
+    def to_runs(self):
+        return [[run.commit, run.length, run.born_commit, run.born_release] for run in self.runs()]
+
+    @staticmethod
+    def from_runs(runs):
+        # Inverse of to_runs()
+        root = None
+        for [commit, length, born_commit, born_release] in runs:
+            root = LineTracker.merge(root, LineRun(commit, length, born_commit, born_release))
+        return LineTracker(root)
+
+    @property
+    def lines(self):
+        return ['N/A'] + [run.commit for run in self.runs() for _ in range(run.length)]
+
+    def commitcounter(self, commit_clock):
+        # Number of commits every line survived given the current commit clock
+        return ['N/A'] + [commit_clock - run.born_commit for run in self.runs() for _ in range(run.length)]
+
+    def releasecounter(self, release_clock):
+        return ['N/A'] + [release_clock - run.born_release for run in self.runs() for _ in range(run.length)]
+
+    @staticmethod
+    def size(node):
+        return node.size if node is not None else 0
+
+    @staticmethod
+    def update(node):
+        node.size = LineTracker.size(node.left) + node.length + LineTracker.size(node.right)
+        return node
+
+    @staticmethod
+    def clone(node, left, right, length=None):
+        # New node with the same run and given children
+        new = LineRun(node.commit, node.length if length is None else length, node.born_commit, node.born_release, node.priority)
+        new.left = left
+        new.right = right
+        return LineTracker.update(new)
+
+    @staticmethod
+    def split(node, k):
+        # First k lines to the left tree, the rest to the right one
+        if node is None:
+            return [None, None]
+        left_size = LineTracker.size(node.left)
+        if k <= 0:
+            return [None, node]
+        if k >= node.size:
+            return [node, None]
+        if k <= left_size:
+            [left, right] = LineTracker.split(node.left, k)
+            if right is not None and right.priority > node.priority:
+                # The tail of a run split below got a higher priority, merged to keep the heap order
+                return [left, LineTracker.merge(right, LineTracker.clone(node, None, node.right))]
+            return [left, LineTracker.clone(node, right, node.right)]
+        if k >= left_size + node.length:
+            [left, right] = LineTracker.split(node.right, k - left_size - node.length)
+            return [LineTracker.clone(node, node.left, left), right]
+        # Split inside the run, the head keeps the priority, the tail gets a fresh one and is
+        # merged with the right subtree (pieces with the same priority would form a chain)
+        offset = k - left_size
+        head = LineTracker.clone(node, node.left, None, offset)
+        tail = LineRun(node.commit, node.length - offset, node.born_commit, node.born_release)
+        return [head, LineTracker.merge(tail, node.right)]
+
+    @staticmethod
+    def merge(left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            return LineTracker.clone(left, left.left, LineTracker.merge(left.right, right))
+        return LineTracker.clone(right, LineTracker.merge(left, right.left), right.right)
+
+    @staticmethod
+    def iterate(node):
+        # In-order traversal of the runs
+        stack = []
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
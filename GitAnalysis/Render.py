@@ -0,0 +1,69 @@
+import os
+import sys
+import warnings
+import numpy as np
+
+
+class Render():
+    # Drawing of the computed series. pyplot is imported on the first plot, with the
+    # non-interactive Agg backend when there is no display, and figures are either shown
+    # or written to a PNG/SVG file. Long series are decimated to min/max per pixel column.
+    formats = ['png', 'svg']
+    # Pixel columns of a figure, twice as many points are kept by decimate()
+    buckets = 2000
+
+    @staticmethod
+    def has_display():
+        if sys.platform in ('win32', 'darwin'):
+            return True
+        return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+    @staticmethod
+    def pyplot():
+        import matplotlib
+        if not Render.has_display() and not os.environ.get('MPLBACKEND'):
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as matplt
+        return matplt
+
+    @staticmethod
+    def finish(fig, output=None, dpi=150):
+        # Shows the figure or saves it to output, the format is given by the file extension
+        matplt = Render.pyplot()
+        if output is None:
+            if Render.has_display():
+                matplt.show()
+            else:
+                warnings.warn('No display to show the figure, use output to save it to a file!')
+        else:
+            fmt = os.path.splitext(output)[1][1:].lower()
+            if fmt not in Render.formats:
+                raise Exception(f'Unsupported output format {output}! Use one of: {", ".join(Render.formats)}.')
+            fig.savefig(output, format=fmt, dpi=dpi)
+            print(f'┣ saved {output}')
+        matplt.close(fig)
+
+    @staticmethod
+    def decimate(x, y, buckets=None):
+        # Indices of the first and the last point and of the minimum and the maximum of y in
+        # each of the buckets equally wide x intervals, x is sorted
+        buckets = buckets if buckets is not None else Render.buckets
+        n = x.size
+        if n <= 2*buckets:
+            return np.arange(n)
+        span = x[-1] - x[0]
+        if span > 0:
+            b = np.minimum(((x - x[0]) * (buckets / span)).astype(np.int64), buckets - 1)
+        else:
+            b = np.arange(n) * buckets // n
+        order = np.lexsort((y, b))
+        b = b[order]
+        first = np.flatnonzero(np.diff(b, prepend=-1))
+        last = np.append(first[1:] - 1, n - 1)
+        return np.unique(np.concatenate((order[first], order[last], [0, n - 1])))
+
+    @staticmethod
+    def line(ax, x, y, *args, **kwargs):
+        # ax.plot() of the decimated series
+        idx = Render.decimate(x, y)
+        return ax.plot(x[idx], y[idx], *args, **kwargs)
@@ -0,0 +1,190 @@
+import os
+import numpy as np
+
+
+class Survival():
+    # Line lifetimes for survival analysis as columns, one record per line or per run of lines:
+    #   duration [days], observed (deleted) or censored (alive at the end), weight (lines),
+    #   file and commit (codes into files and commits)
+    # The deleted lines come from the stats of GitCommit2.track(), the lines alive at HEAD from
+    # the final tracker are right-censored at the end of the history.
+    def __init__(self, duration, observed, weight, file, files, commit, commits):
+        self.duration = np.asarray(duration, dtype=float)
+        self.observed = np.asarray(observed, dtype=bool)
+        self.weight = np.asarray(weight, dtype=float)
+        self.file = np.asarray(file, dtype=np.int64)
+        self.files = np.asarray(files, dtype=str)
+        self.commit = np.asarray(commit, dtype=np.int64)
+        self.commits = np.asarray(commits, dtype=str)
+
+    def __len__(self):
+        return self.duration.size
+
+    @staticmethod
+    def from_tracking(stats, tracker, timestamps, end=None, head_files=None):
+        # stats - GitCommit2.track() stats (list of dicts or Cache columns)
+        # tracker - final {file: LineTracker}, e.g. tracker_history[last commit]['tracker']
+        # timestamps - commit timestamps, e.g. tracker_history.timestamps
+        # end - censoring time, the last commit by default
+        # head_files - files present at HEAD (GitCommit2.get_files()), the trackers of files
+        #              renamed away or deleted are left out of the alive lines
+        if not isinstance(stats, dict):
+            stats = {x: [s.get(x, '') for s in stats] for x in ('file', 'timespan', 'commit')}
+        stats_file = np.asarray(stats['file'], dtype=str)
+        timespan = np.asarray(stats['timespan'], dtype=float)
+        if 'commit' in stats:
+            stats_commit = np.asarray(stats['commit'], dtype=str)
+        else:
+            stats_commit = np.full(timespan.size, '')
+        end = end if end is not None else max(timestamps.values())
+
+        alive_file = []
+        alive_commit = []
+        alive_length = []
+        for file, t in tracker.items():
+            if head_files is not None and file not in head_files:
+                continue
+            for run in t.runs():
+                alive_file.append(file)
+                alive_commit.append(run.commit)
+                alive_length.append(run.length)
+        alive_start = np.array([timestamps[c] for c in alive_commit], dtype=float)
+
+        [files, file] = np.unique(np.concatenate((stats_file, np.asarray(alive_file, dtype=str))), return_inverse=True)
+        [commits, commit] = np.unique(np.concatenate((stats_commit, np.asarray(alive_commit, dtype=str))), return_inverse=True)
+        duration = np.concatenate((timespan, end - alive_start)) / (24*3600)
+        observed = np.concatenate((np.full(timespan.size, True), np.full(alive_start.size, False)))
+        weight = np.concatenate((np.ones(timespan.size), np.asarray(alive_length, dtype=float)))
+        # Lines of commits dated after their removal (rebased history) have no lifetime
+        valid = duration >= 0
+        return Survival(duration[valid], observed[valid], weight[valid], file.ravel()[valid], files,
+                        commit.ravel()[valid], commits)
+
+    @staticmethod
+    def releases(commit_ids, tags):
+        # {commit: release} - the first release at or after the commit in the processing order
+        # (the release shipping its lines), commits after the last release are 'unreleased'
+        names = {}
+        for tag, commit_id in tags.items():
+            names.setdefault(commit_id, tag)
+        out = {}
+        pending = []
+        for commit_id in commit_ids:
+            pending.append(commit_id)
+            if commit_id in names:
+                for c in pending:
+                    out[c] = names[commit_id]
+                pending = []
+        for c in pending:
+            out[c] = 'unreleased'
+        return out
+
+    def groups(self, by=None):
+        # [names, index] of the records grouped by None (all lines), 'file', 'directory' or a
+        # {commit: group} mapping, e.g. the commit authors or Survival.releases()
+        if by is None:
+            return [np.array(['all']), np.zeros(len(self), dtype=np.int64)]
+        if by == 'file':
+            labels = self.files
+            codes = self.file
+        elif by == 'directory':
+            labels = np.array([os.path.dirname(f) for f in self.files.tolist()], dtype=str)
+            codes = self.file
+        elif isinstance(by, dict):
+            labels = np.array([str(by.get(c, '')) for c in self.commits.tolist()], dtype=str)
+            codes = self.commit
+        else:
+            raise Exception(f'Unknown grouping {by}! Use None, "file", "directory" or a {{commit: group}} mapping.')
+        [names, label_index] = np.unique(labels, return_inverse=True)
+        return [names, label_index.ravel()[codes]]
+
+    def kaplan_meier(self, by=None):
+        # {group: {'time', 'survival', 'at_risk', 'events'}} - Kaplan-Meier estimate at every
+        # distinct duration of every group, all groups from one sort
+        [names, g] = self.groups(by)
+        if g.size == 0:
+            return {}
+        # Two stable sorts, by duration then by group, are faster than np.lexsort
+        order = np.argsort(self.duration, kind='stable')
+        order = order[np.argsort(g[order], kind='stable')]
+        g = g[order]
+        t = self.duration[order]
+        w = self.weight[order]
+        d = np.where(self.observed[order], w, 0.0)
+        # Distinct (group, duration) pairs
+        first = np.flatnonzero(np.concatenate(([True], (g[1:] != g[:-1]) | (t[1:] != t[:-1]))))
+        g = g[first]
+        t = t[first]
+        w = np.add.reduceat(w, first)
+        d = np.add.reduceat(d, first)
+        # At risk: the weight of the group minus the weight of the earlier durations
+        total = np.bincount(g, weights=w, minlength=names.size)
+        cum = np.cumsum(w)
+        group_start = np.concatenate(([0.0], np.cumsum(total)[:-1]))
+        at_risk = total[g] - (cum - w - group_start[g])
+        factor = 1.0 - d / at_risk
+        # Product of the factors within the group, once a factor is 0 the curve stays at 0
+        log_factor = np.log(np.where(factor > 0, factor, 1.0))
+        is_zero = (factor <= 0).astype(np.int64)
+        cum_log = np.cumsum(log_factor)
+        cum_zero = np.cumsum(is_zero)
+        boundary = np.flatnonzero(np.concatenate(([True], g[1:] != g[:-1])))
+        counts = np.diff(np.append(boundary, g.size))
+        base = np.repeat(cum_log[boundary] - log_factor[boundary], counts)
+        base_zero = np.repeat(cum_zero[boundary] - is_zero[boundary], counts)
+        survival = np.where(cum_zero - base_zero > 0, 0.0, np.exp(cum_log - base))
+        out = {}
+        for k, b in enumerate(boundary.tolist()):
+            e = b + counts[k]
+            out[str(names[g[b]])] = {'time': t[b:e], 'survival': survival[b:e], 'at_risk': at_risk[b:e], 'events': d[b:e]}
+        return out
+
+    def weibull(self, by=None, iterations=100, tol=1e-10):
+        # {group: {'alpha', 'beta', 'lines', 'deleted'}} - maximum likelihood Weibull fit with the
+        # censored lines (alpha scale [days], beta shape), Newton iterations on beta for all groups
+        # at once. Zero durations (lines deleted by the commit dated as the one adding them) are left out.
+        [names, g] = self.groups(by)
+        valid = self.duration > 0
+        g = g[valid]
+        x = self.duration[valid]
+        w = self.weight[valid]
+        d = np.where(self.observed[valid], w, 0.0)
+        m = names.size
+        lines = np.bincount(g, weights=w, minlength=m)
+        r = np.bincount(g, weights=d, minlength=m)
+        # Durations scaled by the group maximum so that x**beta stays finite
+        scale = np.zeros(m)
+        np.maximum.at(scale, g, x)
+        lx = np.log(x / scale[g])
+        a = np.bincount(g, weights=d*lx, minlength=m) / np.where(r > 0, r, 1)
+        beta = np.ones(m)
+        for i in range(iterations):
+            xb = np.exp(beta[g]*lx)
+            c = np.bincount(g, weights=w*xb, minlength=m)
+            b = np.bincount(g, weights=w*xb*lx, minlength=m)
+            e = np.bincount(g, weights=w*xb*lx*lx, minlength=m)
+            c = np.where(c > 0, c, 1)
+            f = 1/beta + a - b/c
+            df = -1/beta**2 - (e*c - b*b)/c**2
+            step = f / df
+            beta_new = beta - step
+            # Keep the shape positive
+            beta_new = np.where(beta_new > 0, beta_new, beta/2)
+            converged = np.all((np.abs(beta_new - beta) <= tol*beta) | (r == 0))
+            beta = beta_new
+            if converged:
+                break
+        c = np.bincount(g, weights=w*np.exp(beta[g]*lx), minlength=m)
+        alpha = scale * (c / np.where(r > 0, r, 1))**(1/beta)
+        out = {}
+        for k, name in enumerate(names.tolist()):
+            if lines[k] == 0:
+                continue
+            fit = r[k] > 0
+            out[name] = {
+                'alpha': float(alpha[k]) if fit else float('nan'),
+                'beta': float(beta[k]) if fit else float('nan'),
+                'lines': float(lines[k]),
+                'deleted': float(r[k])
+            }
+        return out
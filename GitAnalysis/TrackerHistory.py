@@ -0,0 +1,80 @@
+import bisect
+
+from .LineTracker import LineTracker
+
+
+class TrackerHistory():
+    # Tracker state after every processed commit as a delta log of the changed file roots
+    # with full snapshots (checkpoints) taken according to the policy:
+    #   'all'     - every commit, a {file: root} dict per commit, O(commits x files) in total
+    #   'release' - release commits only
+    #   N         - every N commits
+    # The LineTracker nodes are shared between the states, so a state between the checkpoints
+    # costs O(changed files).
+    # base/timestamps - tracker state and commit timestamps before the first recorded commit
+    def __init__(self, policy='all', base=None, timestamps=None):
+        if not (policy in ('all', 'release') or (isinstance(policy, int) and policy > 0)):
+            raise Exception(f'Unknown snapshot policy {policy}! Use "all", "release" or a number of commits.')
+        self.policy = policy
+        self.commits = []
+        self.index = {}
+        self.timestamps = dict(timestamps) if timestamps is not None else {}
+        self.base = {f: t.root for f, t in base.items()} if base is not None else {}
+        self.clocks = []
+        self.deltas = []
+        self.snapshots = {}
+        self.checkpoints = []
+
+    def record(self, commit_id, timestamp, clock, tracker, changed_files, isReleaseCommit):
+        idx = len(self.commits)
+        self.commits.append(commit_id)
+        self.index[commit_id] = idx
+        self.timestamps[commit_id] = timestamp
+        self.clocks.append(clock)
+        if self.policy == 'all' or (self.policy == 'release' and isReleaseCommit) \
+                or (isinstance(self.policy, int) and (idx + 1) % self.policy == 0):
+            self.snapshots[idx] = {f: t.root for f, t in tracker.items()}
+            self.checkpoints.append(idx)
+            # The state of a checkpoint is rebuilt from its snapshot, its delta is never read
+            self.deltas.append(None)
+        else:
+            self.deltas.append({f: tracker[f].root for f in changed_files})
+
+    def tracker(self, commit_id):
+        # Reconstructs {file: LineTracker} from the closest checkpoint and the deltas after it
+        idx = self.index[commit_id]
+        pos = bisect.bisect_right(self.checkpoints, idx) - 1
+        if pos >= 0:
+            start = self.checkpoints[pos]
+            roots = dict(self.snapshots[start])
+            start += 1
+        else:
+            start = 0
+            roots = dict(self.base)
+        for delta in self.deltas[start:idx + 1]:
+            roots.update(delta)
+        return {f: LineTracker(root) for f, root in roots.items()}
+
+    def __getitem__(self, commit_id):
+        idx = self.index[commit_id]
+        return {
+            'timestamp': self.timestamps[commit_id],
+            'clock': self.clocks[idx],
+            'tracker': self.tracker(commit_id)
+        }
+
+    def __contains__(self, commit_id):
+        return commit_id in self.index
+
+    def __iter__(self):
+        return iter(self.commits)
+
+    def __len__(self):
+        return len(self.commits)
+
+    def keys(self):
+        return list(self.commits)
+
+    def items(self):
+        for commit_id in self.commits:
+            yield commit_id, self[commit_id]
@@ -0,0 +1,81 @@
+import json
+import sqlite3
+
+from .LineTracker import LineTracker
+
+
+class TrackerStore():
+    # SQLite file keeping the tracker state between GitCommit2.track() runs:
+    # seen commits, patch-id blacklist, per-file runs, clocks and the gathered stats.
+    # A checkpoint is one transaction, an interrupted run resumes from the last one.
+    version = 1
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.db = sqlite3.connect(fn)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS commits (id TEXT PRIMARY KEY, timestamp REAL, processed INTEGER);
+            CREATE TABLE IF NOT EXISTS blacklist (patch_id TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS files (name TEXT PRIMARY KEY, bad INTEGER, runs TEXT);
+            CREATE TABLE IF NOT EXISTS stats (file TEXT, line INTEGER, timeend REAL, timestart REAL, timespan REAL, commit_id TEXT);
+            """)
+        meta = dict(self.db.execute("SELECT key, value FROM meta"))
+        if not meta:
+            self.db.execute("INSERT INTO meta VALUES ('version', ?)", (str(TrackerStore.version),))
+            self.db.commit()
+        elif int(meta['version']) != TrackerStore.version:
+            raise Exception(f'Tracker store {fn} has version {meta["version"]}, expected {TrackerStore.version}!')
+        self.seen = set(r[0] for r in self.db.execute("SELECT id FROM commits"))
+        self.pending = []
+        self.saved_stats = self.db.execute("SELECT COUNT(*) FROM stats").fetchone()[0]
+        self.saved_blacklist = set(r[0] for r in self.db.execute("SELECT patch_id FROM blacklist"))
+
+    def __contains__(self, commit_id):
+        return commit_id in self.seen
+
+    def __len__(self):
+        return len(self.seen)
+
+    def load(self):
+        meta = dict(self.db.execute("SELECT key, value FROM meta"))
+        tracker = {}
+        bad_files = set()
+        for name, bad, runs in self.db.execute("SELECT name, bad, runs FROM files"):
+            tracker[name] = LineTracker.from_runs(json.loads(runs))
+            if bad:
+                bad_files.add(name)
+        stats = []
+        for r in self.db.execute("SELECT file, line, timeend, timestart, timespan, commit_id FROM stats ORDER BY rowid"):
+            stats.append({'file': r[0], 'line': r[1], 'timeend': r[2], 'timestart': r[3], 'timespan': r[4], 'commit': r[5]})
+        return {
+            'tracker': tracker,
+            'bad_files': bad_files,
+            'blacklist': set(self.saved_blacklist),
+            'stats': stats,
+            'timestamps': dict(self.db.execute("SELECT id, timestamp FROM commits WHERE processed = 1")),
+            'clock': json.loads(meta.get('clock', '[0, 0]')),
+            'last_commit': meta.get('last_commit')
+        }
+
+    def add(self, commit_id, timestamp, processed):
+        self.seen.add(commit_id)
+        self.pending.append((commit_id, timestamp, int(processed)))
+
+    def checkpoint(self, tracker, changed_files, bad_files, blacklist, stats, clock):
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO commits VALUES (?, ?, ?)", self.pending)
+            self.db.executemany("INSERT OR IGNORE INTO blacklist VALUES (?)", ((p,) for p in blacklist - self.saved_blacklist))
+            self.db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (
+                (f, int(f in bad_files), json.dumps(tracker[f].to_runs())) for f in changed_files if f in tracker))
+            self.db.executemany("INSERT INTO stats VALUES (?, ?, ?, ?, ?, ?)", (
+                (s['file'], s['line'], s['timeend'], s['timestart'], s['timespan'], s['commit']) for s in stats[self.saved_stats:]))
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('clock', ?)", (json.dumps(clock),))
+            if self.pending:
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('last_commit', ?)", (self.pending[-1][0],))
+        self.pending = []
+        self.saved_stats = len(stats)
+        self.saved_blacklist |= blacklist
+
+    def close(self):
+        self.db.close()
@@ -1,3 +1,19 @@
 from .GitAnalysis import GitAnalysis
 from .GitAnalysis import GitCommit
-from .GitAnalysis import GitCommit2
\ No newline at end of file
+from .GitAnalysis import GitCommit2
+from .GitLog import GitLog
+from .GitTags import GitTags
+from .GitDiff import GitDiff
+from .LineTracker import LineTracker
+from .TrackerHistory import TrackerHistory
+from .TrackerStore import TrackerStore
+from .Kernels import Kernel
+from .Kernels import ExponentialKernel
+from .Kernels import WeibullKernel
+from .Kernels import EmpiricalKernel
+from .CommitTable import CommitTable
+from .Cache import Cache
+from .Render import Render
+from .Batch import Batch
+from .Survival import Survival
+from .Correlation import Correlation
\ No newline at end of file
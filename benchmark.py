@@ -0,0 +1,648 @@
+import os
+import csv
+import time
+import random
+import datetime
+import shutil
+import statistics
+import pickle
+import argparse
+import resource
+import warnings
+import tempfile
+import threading
+import http.server
+import contextlib
+import subprocess
+import multiprocessing
+import numpy as np
+
+from GitAnalysis import *
+from tests.helpers import BuglistHandler, synthetic_repo
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        __file__, description="Benchmarks of the Git commit history analysis on a synthetic repository"
+    )
+    parser.add_argument(
+        "bench",
+        help="Benchmark to run",
+        choices=sorted(BENCHMARKS.keys())
+    )
+    parser.add_argument(
+        "--commits",
+        help="Number of commits of the synthetic repository",
+        dest="commits",
+        type=int,
+        default=2000
+    )
+    parser.add_argument(
+        "--files",
+        help="Number of files of the synthetic repository",
+        dest="files",
+        type=int,
+        default=50
+    )
+    parser.add_argument(
+        "--repo",
+        help="Where the synthetic repository is created (re-used if it exists)",
+        dest="repo",
+        default='./tests/clones/synthetic/'
+    )
+    return parser.parse_args()
+
+def bench_ingest(args):
+    repo = synthetic_repo(args.repo, args.commits, args.files)
+    workdir = tempfile.mkdtemp()
+    try:
+        os.makedirs(os.path.join(workdir, 'data'))
+        start = time.perf_counter()
+        subprocess.run(['bash', os.path.abspath('gitlogs2csv.sh'), repo], cwd=workdir,
+                       stdout=subprocess.DEVNULL, check=True)
+        t_shell = time.perf_counter() - start
+        with open(os.path.join(workdir, 'data', 'output.csv'), 'r') as csv_file:
+            shell_rows = {r[0]: r for r in list(csv.reader(csv_file))[1:]}
+
+        start = time.perf_counter()
+        line_count = GitLog(repo).export_csv(os.path.join(workdir, 'native.csv'))
+        t_native = time.perf_counter() - start
+        with open(os.path.join(workdir, 'native.csv'), 'r') as csv_file:
+            native_rows = {r[0]: r for r in list(csv.reader(csv_file))[1:]}
+    finally:
+        shutil.rmtree(workdir)
+
+    mismatches = 0
+    for commit_id, r in shell_rows.items():
+        if [x.strip() for x in r] != native_rows.get(commit_id):
+            mismatches += 1
+    print(f'gitlogs2csv.sh : {t_shell:8.3f} s ({len(shell_rows)} commits)')
+    print(f'GitLog         : {t_native:8.3f} s ({line_count} commits)')
+    print(f'speed-up       : {t_shell/t_native:8.1f} x, {mismatches} mismatching rows')
+
+def bench_commits(args):
+    repo = synthetic_repo(args.repo, args.commits, args.files)
+    test = GitCommit2(repo)
+    start = time.perf_counter()
+    legacy = test.get_all_commits(batched=False)
+    t_legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = test.get_all_commits()
+    t_batched = time.perf_counter() - start
+
+    print(f'per-commit patch-id : {len(legacy)/t_legacy:10.1f} commits/s')
+    print(f'streamed patch-id   : {len(batched)/t_batched:10.1f} commits/s')
+    print(f'identical output    : {legacy == batched}')
+
+def bench_tracker(args):
+    # Random hunks applied to a file of 10k-100k lines, LineTracker against the per-line lists
+    for n in (10000, 100000):
+        rnd = random.Random(n)
+        workload = []
+        size = n
+        for i in range(args.commits // 10):
+            deleted = []
+            added = []
+            for _ in range(rnd.randint(1, 5)):
+                length = rnd.randint(1, 200)
+                start = rnd.randint(1, max(1, size - length))
+                deleted.append((start, length))
+            deleted = GitDiff.normalize({'f': {'added': [], 'deleted': deleted}})['f']['deleted']
+            size -= sum(length for start, length in deleted)
+            for _ in range(rnd.randint(1, 5)):
+                added.append((rnd.randint(1, size + 1), rnd.randint(1, 200)))
+            added = GitDiff.normalize({'f': {'added': added, 'deleted': []}})['f']['added']
+            size += sum(length for start, length in added)
+            workload.append([f'c{i}', deleted, added, i % 10 == 0])
+
+        start = time.perf_counter()
+        lines = ['N/A'] + ['c'] * n
+        commitcounter = ['N/A'] + [0] * n
+        releasecounter = ['N/A'] + [0] * n
+        for commit, deleted, added, isReleaseCommit in workload:
+            for l in GitDiff.expand({'f': {'added': [], 'deleted': deleted}})['f']['deleted']:
+                lines.pop(l)
+                commitcounter.pop(l)
+                releasecounter.pop(l)
+            for l in GitDiff.expand({'f': {'added': added, 'deleted': []}})['f']['added']:
+                lines.insert(l, commit)
+                commitcounter.insert(l, 0)
+                releasecounter.insert(l, 0)
+            for i in range(1, len(commitcounter)):
+                commitcounter[i] += 1
+                if isReleaseCommit:
+                    releasecounter[i] += 1
+        t_list = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tracker = LineTracker()
+        tracker.insert(1, n, 'c')
+        commit_clock = 0
+        release_clock = 0
+        for commit, deleted, added, isReleaseCommit in workload:
+            for first, length in deleted:
+                tracker.delete(first, length)
+            for first, length in added:
+                tracker.insert(first, length, commit, commit_clock, release_clock)
+            commit_clock += 1
+            if isReleaseCommit:
+                release_clock += 1
+        t_tracker = time.perf_counter() - start
+
+        print(f'{n:7d} lines, {len(workload)} commits: lists {t_list:8.3f} s, LineTracker {t_tracker:8.3f} s')
+
+def history_footprint(repo, policy, queue):
+    warnings.simplefilter('ignore')
+    test = GitCommit2(repo)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        [stats, tracker_history] = test.track(test.iter_commits(), test.get_all_tags(), policy or 'release')
+    if policy is None:
+        # Per-line lists of every commit, the tracker history before TrackerHistory
+        history = {}
+        for commit_id, h in tracker_history.items():
+            history[commit_id] = {'timestamp': h['timestamp'], 'tracker': {}}
+            for f, t in h['tracker'].items():
+                history[commit_id]['tracker'][f] = {
+                    'lines': t.lines,
+                    'commitcounter': t.commitcounter(h['clock'][0]),
+                    'releasecounter': t.releasecounter(h['clock'][1])
+                }
+        tracker_history = history
+    size = len(pickle.dumps([stats, tracker_history]))
+    queue.put([resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, size])
+
+def bench_history(args):
+    repo = synthetic_repo(args.repo, args.commits, args.files)
+    for policy in [None, 'all', 'release', 100]:
+        queue = multiprocessing.Queue()
+        p = multiprocessing.Process(target=history_footprint, args=(repo, policy, queue))
+        p.start()
+        [maxrss, size] = queue.get()
+        p.join()
+        name = 'deep copies' if policy is None else f'snapshots={policy}'
+        print(f'{name:20s}: peak RSS {maxrss/1024:8.1f} MB, pickle {size/1024/1024:8.1f} MB')
+
+def bench_faultscore(args):
+    alfa = -1.0 * np.log(0.05) / 30
+    rnd = np.random.default_rng(0)
+    for n in (1000, 10000, 100000, 1000000):
+        t = np.cumsum(rnd.exponential(1.0, n))
+        y = np.cumsum(rnd.integers(0, 500, n)).astype(float)
+        start = time.perf_counter()
+        GitAnalysis.fault_score(t, y, alfa)
+        t_fast = time.perf_counter() - start
+        line = f'{n:8d} commits: fault_score {t_fast:8.3f} s'
+        if n <= 1000:
+            # The double loop used by plot2 before, compared in tests/test_fault_score.py
+            start = time.perf_counter()
+            p_ref = np.full(t.size, 0.0)
+            for i, t1 in enumerate(t):
+                for t2 in t[i:]:
+                    p_ref[i] = p_ref[i] + y[i]*GitAnalysis.exponential(t2 - t1, alfa)
+            t_ref = time.perf_counter() - start
+            line += f', double loop {t_ref:8.3f} s'
+        print(line)
+
+def bench_table(args):
+    workdir = tempfile.mkdtemp()
+    try:
+        for n in (10000, 100000, 1000000):
+            fn = os.path.join(workdir, f'output_{n}.csv')
+            rnd = random.Random(n)
+            with open(fn, 'w', newline='') as csv_file:
+                csv_writer = csv.writer(csv_file, delimiter=",")
+                csv_writer.writerow(GitLog.fields)
+                for i in range(n):
+                    date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(1420070400 + 600*i))
+                    csv_writer.writerow([f'{i:09x}', f'Author {i % 50}', date, rnd.randint(1, 9),
+                                         rnd.randint(0, 500), rnd.randint(0, 500), 'v1' if i % 1000 == 0 else ''])
+
+            line = f'{n:8d} commits:'
+            if n <= 100000:
+                # Row objects used by GitAnalysis before
+                start = time.perf_counter()
+                with open(fn, 'r') as csv_file:
+                    csv_reader = csv.reader(csv_file, delimiter=",")
+                    next(csv_reader)
+                    commits = [GitCommit(row) for row in csv_reader]
+                t = np.array([c.timestamp for c in commits])
+                y = np.array([c.lines_weighted for c in commits])
+                line += f' GitCommit rows {time.perf_counter() - start:8.3f} s,'
+            start = time.perf_counter()
+            table = CommitTable.from_csv(fn)
+            t = table.timestamp
+            y = table.lines_weighted
+            line += f' CommitTable {time.perf_counter() - start:8.3f} s'
+            print(line)
+    finally:
+        shutil.rmtree(workdir)
+
+def bench_steadystate(args):
+    rnd = np.random.default_rng(0)
+    for n in (1000, 10000, 100000):
+        t_scan = 0
+        t_fast = 0
+        for k in range(10):
+            t = np.cumsum(rnd.exponential(1.0, n))
+            # Bursts of commits with quiet periods, some equal values
+            y = np.cumsum(rnd.integers(0, 50, n) * (rnd.random(n) < 0.3)).astype(float)
+            y = y - y[0]
+            min_dt = rnd.uniform(1, 50)
+            relative_band = rnd.uniform(0.0001, 0.05)
+            start = time.perf_counter()
+            GitAnalysis.findSteadyStateScan(t, y, min_dt, relative_band)
+            t_scan += time.perf_counter() - start
+            start = time.perf_counter()
+            GitAnalysis.findSteadyState(t, y, min_dt, relative_band)
+            t_fast += time.perf_counter() - start
+        print(f'{n:7d} samples x 10: scan {t_scan:8.3f} s, binary search {t_fast:8.3f} s')
+
+def bench_render(args):
+    matplt = Render.pyplot()
+    workdir = tempfile.mkdtemp()
+    rnd = np.random.default_rng(0)
+    try:
+        for n in (10000, 100000, 1000000):
+            t = np.cumsum(rnd.exponential(1.0, n))
+            y = np.cumsum(rnd.integers(0, 500, n)).astype(float)
+            for fmt in Render.formats:
+                times = []
+                for decimate in (False, True):
+                    start = time.perf_counter()
+                    [fig, ax] = matplt.subplots()
+                    if decimate:
+                        Render.line(ax, t, y, linewidth=1.0)
+                    else:
+                        ax.plot(t, y, linewidth=1.0)
+                    fig.savefig(os.path.join(workdir, f'render_{n}_{decimate}.{fmt}'))
+                    matplt.close(fig)
+                    times.append(time.perf_counter() - start)
+                print(f'{n:8d} points {fmt}: full {times[0]:8.3f} s, min/max decimated {times[1]:8.3f} s ({Render.decimate(t, y).size} points)')
+    finally:
+        shutil.rmtree(workdir)
+
+def bench_batch(args):
+    workdir = tempfile.mkdtemp()
+    try:
+        repos = [synthetic_repo(os.path.join(workdir, f'repo{i}'), args.commits, args.files, seed=i) for i in range(8)]
+        results = {}
+        for processes in (1, None):
+            start = time.perf_counter()
+            rows = Batch(repos, os.path.join(workdir, 'data'), processes=processes).run()
+            elapsed = time.perf_counter() - start
+            results[processes] = [{x: r[x] for x in Batch.fields if not x.endswith('_s')} for r in rows]
+            name = 'sequential' if processes == 1 else f'pool of {os.cpu_count()}'
+            print(f'{name:12s}: {elapsed:8.3f} s for {len(repos)} repositories of {args.commits} commits')
+        Batch.print_summary(rows)
+        print(f'identical summaries: {results[1] == results[None]}')
+    finally:
+        shutil.rmtree(workdir)
+
+def bench_parallel(args):
+    repo = synthetic_repo(args.repo, args.commits, args.files)
+    test = GitCommit2(repo)
+    commits = test.get_all_commits()
+    tags = test.get_all_tags()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            [stats, tracker_history] = test.track(commits, tags)
+        print(f'track()            : {time.perf_counter() - start:8.3f} s, {len(stats)} deleted lines')
+        cores = sorted(set([2**k for k in range((os.cpu_count() or 1).bit_length())] + [os.cpu_count() or 1]))
+        for snapshots in ('all', None):
+            for processes in cores:
+                start = time.perf_counter()
+                [p_stats, p_history] = test.track_parallel(commits, tags, snapshots, processes)
+                elapsed = time.perf_counter() - start
+                print(f'track_parallel({processes:2d}) : {elapsed:8.3f} s, snapshots={snapshots}')
+
+def bench_survival(args):
+    rnd = np.random.default_rng(0)
+    for n in (10000, 100000, 1000000):
+        start = rnd.uniform(1.4e9, 1.6e9, n)
+        span = rnd.exponential(90*24*3600, n)
+        stats = {'timestart': start, 'timeend': start + span, 'timespan': span}
+        t0 = time.perf_counter()
+        [t, _] = GitAnalysis.survival_quantiles(stats, 30, [0.25, 0.5, 0.75])
+        t_fast = time.perf_counter() - t0
+        # Direct median of the alive lines at every step, compared in tests/test_survival_quantiles.py
+        t0 = time.perf_counter()
+        for x in t:
+            x = x*24*3600
+            np.median(span[(start <= x) & (start + span >= x)])
+        t_direct = time.perf_counter() - t0
+        line = f'{n:8d} lines, {t.size} steps: survival_quantiles {t_fast:8.3f} s, direct numpy {t_direct:8.3f} s'
+        if n <= 10000:
+            # The loop of main_experimental before
+            rows = [{'timestart': a, 'timeend': a + b, 'timespan': b} for a, b in zip(start.tolist(), span.tolist())]
+            t0 = time.perf_counter()
+            for x in range(int(start.min()), int((start + span).max()), 24*3600*30):
+                tspans = []
+                for i, s in enumerate(rows):
+                    if x > s['timeend']:
+                        del rows[i]
+                    elif x >= s['timestart'] and x <= s['timeend']:
+                        if s['timespan'] >= 0:
+                            tspans.append(s['timespan'])
+                if tspans:
+                    statistics.median(tspans)
+            line += f', list loop {time.perf_counter() - t0:8.3f} s'
+        print(line)
+
+def bench_lifetimes(args):
+    repo = synthetic_repo(args.repo, args.commits, args.files)
+    test = GitCommit2(repo)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        [stats, tracker_history] = test.track_parallel(test.get_all_commits(), test.get_all_tags(), 'release')
+    last_commit = tracker_history.keys()[-1]
+    start = time.perf_counter()
+    survival = Survival.from_tracking(stats, tracker_history[last_commit]['tracker'], tracker_history.timestamps,
+                                      head_files=test.get_files())
+    km = survival.kaplan_meier()['all']
+    fit = survival.weibull()['all']
+    print(f'{len(survival)} records of {int(survival.weight.sum())} lines in {time.perf_counter() - start:.3f} s')
+    median = km['time'][np.argmax(km['survival'] <= 0.5)] if km['survival'][-1] <= 0.5 else float('inf')
+    print(f'Kaplan-Meier median lifetime {median:.1f} days, Weibull alpha {fit["alpha"]:.1f} days beta {fit["beta"]:.3f}')
+    # Deleted lines only, as the stats alone would give
+    deleted = Survival(survival.duration[survival.observed], survival.observed[survival.observed],
+                       survival.weight[survival.observed], survival.file[survival.observed], survival.files,
+                       survival.commit[survival.observed], survival.commits).weibull()['all']
+    print(f'Without the alive lines: Weibull alpha {deleted["alpha"]:.1f} days beta {deleted["beta"]:.3f}')
+
+    rnd = np.random.default_rng(0)
+    for n in (1000000, 10000000):
+        survival = Survival(rnd.weibull(0.8, n)*100, rnd.random(n) < 0.7, np.ones(n), rnd.integers(0, 1000, n),
+                            [f'dir{i // 100}/file{i}.c' for i in range(1000)], np.zeros(n, dtype=np.int64), ['c'])
+        start = time.perf_counter()
+        survival.kaplan_meier('directory')
+        t_km = time.perf_counter() - start
+        start = time.perf_counter()
+        survival.weibull('file')
+        t_fit = time.perf_counter() - start
+        print(f'{n:9d} records: Kaplan-Meier per directory {t_km:8.3f} s, Weibull per file {t_fit:8.3f} s')
+
+def bench_blame(args):
+    repo = synthetic_repo(args.repo, args.commits, args.files)
+    test = GitCommit2(repo)
+    tags = test.get_all_tags()
+    releases = list(dict.fromkeys(tags.values()))[::5]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        start = time.perf_counter()
+        [stats, tracker_history] = test.track_parallel(test.get_all_commits(), tags, 'release')
+        t_replay = time.perf_counter() - start
+    print(f'replay of the history : {t_replay:8.3f} s')
+    for workers in (1, 8):
+        start = time.perf_counter()
+        snapshot = test.blame_snapshot(releases, workers)
+        print(f'blame, {workers} threads     : {time.perf_counter() - start:8.3f} s for {len(releases)} releases')
+    # track() sends the deletions of a renamed and modified file to the old name, the renamed
+    # files (file<N>_<commit>.c) are left out of the comparison
+    files = 0
+    mismatches = 0
+    for c in releases:
+        tracker = tracker_history[c]['tracker']
+        for f, t in snapshot[c].items():
+            if '_' in os.path.basename(f):
+                continue
+            files += 1
+            mismatches += f not in tracker or tracker[f].lines != t.lines
+    print(f'{files} files compared, {mismatches} mismatches')
+
+def bench_bugzilla(args):
+    from bugzilla.busybox import Bugzilla, CraftBench
+    rnd = random.Random(0)
+    # Bugs opened every week from 2019 to 2022
+    start_date = datetime.datetime(2019, 1, 1)
+    BuglistHandler.bugs = sorted(
+        (i, str((start_date + datetime.timedelta(days=rnd.randrange(4*365))).date())) for i in range(3000))
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), BuglistHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f'http://127.0.0.1:{server.server_address[1]}/'
+    workdir = tempfile.mkdtemp()
+    from_date = datetime.datetime(2023, 1, 1)
+    to_date = datetime.datetime(2019, 1, 1)
+    try:
+        results = {}
+        runs = [
+            ('serial, 7 day windows', dict(workers=1), None),
+            ('8 threads', dict(workers=8), None),
+            ('8 threads, cold cache', dict(workers=8), os.path.join(workdir, 'cache')),
+            ('8 threads, warm cache', dict(workers=8), os.path.join(workdir, 'cache')),
+            ('8 threads, adaptive', dict(workers=8, adaptive=True), None),
+        ]
+        for name, options, cache_dir in runs:
+            bench = CraftBench(Bugzilla(host, workers=options['workers'], cache_dir=cache_dir, mode='html'))
+            BuglistHandler.requests = 0
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(open(os.devnull, 'w')):
+                results[name] = bench.prepare_time_series('1.35', from_date, to_date, 7, **options)
+            elapsed = time.perf_counter() - start
+            print(f'{name:24s}: {elapsed:8.3f} s, {BuglistHandler.requests:4d} requests, {len(results[name])} bugs')
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir)
+
+def bench_bugexport(args):
+    from bugzilla.busybox import Bugzilla, CraftBench
+    rnd = random.Random(0)
+    start_date = datetime.datetime(2019, 1, 1)
+    BuglistHandler.bugs = sorted(
+        (i, str((start_date + datetime.timedelta(days=rnd.randrange(4*365))).date())) for i in range(50000))
+    BuglistHandler.limit = 10**9
+    BuglistHandler.delay = 0
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), BuglistHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f'http://127.0.0.1:{server.server_address[1]}/'
+    from_date = datetime.datetime(2023, 1, 1)
+    to_date = datetime.datetime(2019, 1, 1)
+    try:
+        # Responses for the whole period recorded once, then parsed from memory
+        bugzilla = Bugzilla(host, page_size=100000)
+        recorded = {
+            'html': bugzilla.get(bugzilla.param_base.format(date_from='2019-01-01', date_to='2023-01-01', version='1.35')),
+            'csv': bugzilla.get(bugzilla.param_csv.format(date_from='2019-01-01', date_to='2023-01-01', version='1.35')),
+            'rest': bugzilla.get(bugzilla.param_rest.format(date_from='2019-01-01', date_after='2023-01-02', version='1.35', limit=100000, offset=0)),
+        }
+        bugzilla.get = lambda params: recorded['rest'] if params.startswith('rest/') else \
+            recorded['csv'] if 'ctype=csv' in params else recorded['html']
+        results = {}
+        for mode in Bugzilla.modes:
+            start = time.perf_counter()
+            [ids, opened] = getattr(bugzilla, f'fetch_opened_{mode}')('2019-01-01', '2023-01-01', '1.35')
+            elapsed = time.perf_counter() - start
+            results[mode] = (ids.tolist(), opened.tolist())
+            print(f'{mode:4s}: {len(recorded[mode])/1024/1024:6.2f} MB response parsed in {elapsed:8.3f} s ({ids.size} bugs)')
+        print(f"identical arrays: {results['rest'] == results['csv'] == results['html']}")
+
+        # End to end over the stand-in server, REST missing falls back to CSV
+        series = {}
+        for mode, rest in (('html', True), ('csv', True), ('rest', True), ('auto', False)):
+            BuglistHandler.rest = rest
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(open(os.devnull, 'w')):
+                series[mode] = CraftBench(Bugzilla(host, mode=mode)).prepare_time_series('1.35', from_date, to_date, 7)
+            print(f'prepare_time_series {mode:4s}{"" if rest else " (no REST)"}: {time.perf_counter() - start:8.3f} s, {len(series[mode])} bugs')
+        print(f"identical series: {series['html'] == series['csv'] == series['rest'] == series['auto']}")
+    finally:
+        BuglistHandler.rest = True
+        server.shutdown()
+
+def bench_weibull(args):
+    from bugzilla.busybox import RELEASES, CraftBench
+    from reliability.Probability_plotting import plotting_positions
+    from scipy.stats import weibull_min
+    # Bug opening times [days since the release] of every Busybox release and of the tags of
+    # a larger project (--commits series)
+    rng = np.random.default_rng(0)
+    names = [v for v, _ in RELEASES] + [f'v{i}' for i in range(args.commits)]
+    shape = rng.uniform(0.5, 3.0, len(names))
+    series = {v: rng.weibull(shape[i], rng.integers(5, 500)) * rng.uniform(30, 1000) for i, v in enumerate(names)}
+
+    start = time.perf_counter()
+    table = CraftBench.fit_weibull_batch(series)
+    batch = time.perf_counter() - start
+
+    # Per version as in CraftBench.do_research before: plotting positions and np.polyfit
+    start = time.perf_counter()
+    loop = {}
+    for v, x in series.items():
+        [t, F] = plotting_positions(failures=x)
+        [m, c] = np.polyfit(np.log(t), np.log(-np.log(1 - F)), 1)
+        loop[v] = (np.exp(-c / m), m)
+    polyfit = time.perf_counter() - start
+    rr = np.array([loop[v] for v in names])
+    rr_error = np.max(np.abs(table[['alpha_rr', 'beta_rr']].to_numpy() / rr - 1))
+
+    start = time.perf_counter()
+    mle = np.array([weibull_min.fit(series[v], floc=0)[::-2] for v in names[:100]])
+    scipy = (time.perf_counter() - start) * len(names) / 100
+    mle_error = np.max(np.abs(table[['alpha', 'beta']].to_numpy()[:100] / mle - 1))
+
+    covered = np.mean((table['beta_lower'] <= shape) & (shape <= table['beta_upper']))
+    print(f'{len(names)} series, {int(table["n"].sum())} failures')
+    print(f'batch (rank regression + MLE + bounds): {batch:8.3f} s')
+    print(f'per version polyfit:                    {polyfit:8.3f} s, max relative difference {rr_error:.2e}')
+    print(f'per version scipy MLE (extrapolated):   {scipy:8.3f} s, max relative difference {mle_error:.2e}')
+    print(f'true beta inside the 95% bounds: {covered:.1%}')
+
+def bench_correlation(args):
+    import re
+    # Commit table and messages of a large project with a tag every 500 commits, a third of the
+    # commits reference bugs in different styles, half of the references are to known bugs
+    rng = np.random.default_rng(0)
+    n = 300000
+    timestamp = 16000 + np.cumsum(rng.uniform(0, 0.02, n))
+    commit_id = np.array([f'{i:08x}' for i in range(n)])
+    tag = np.where(np.arange(n) % 500 == 499, np.char.add('v', np.arange(n).astype(str)), '')
+    table = CommitTable({'commit_id': commit_id, 'author': np.full(n, 'a'), 'date': np.full(n, ''),
+                         'changed_files': np.ones(n), 'lines_added': rng.integers(0, 100, n),
+                         'lines_deleted': rng.integers(0, 50, n), 'tag': tag, 'timestamp': timestamp})
+    bugs = 100000
+    bug_ids = rng.permutation(np.arange(1, 2 * bugs))[:bugs]
+    opened = np.sort(rng.uniform(timestamp[0], timestamp[-1], bugs)) * 24 * 3600
+    styles = ['Closes #{}', 'Fixes: #{}', 'bug {} in the parser', 'see show_bug.cgi?id={}', 'BZ#{} and bug #{}']
+    lines = []
+    for i in range(n):
+        lines.append(f'{GitLog.marker}{commit_id[i]}')
+        lines.append(f'Change {i} of the code')
+        if i % 3 == 0:
+            b = rng.integers(1, 2 * bugs, 2)
+            lines.append(styles[i % len(styles)].format(*b))
+
+    start = time.perf_counter()
+    refs = list(Correlation.scan_lines(lines))
+    scan = time.perf_counter() - start
+    # Every pattern on its own over every message line
+    start = time.perf_counter()
+    separate = set()
+    for i, o in enumerate(lines):
+        if o.startswith(GitLog.marker):
+            commit = o[1:]
+            continue
+        for p in Correlation.patterns:
+            separate.update((commit, int(x)) for x in re.findall(p, o, re.IGNORECASE))
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    correlation = Correlation(table, bug_ids, opened, refs)
+    link = time.perf_counter() - start
+    start = time.perf_counter()
+    out = correlation.releases()
+    releases = time.perf_counter() - start
+
+    # Per release with Python loops as a reference
+    start = time.perf_counter()
+    release_t = timestamp[tag != '']
+    bug_days = opened / (24 * 3600)
+    naive = []
+    for k, t_release in enumerate(release_t):
+        t_next = release_t[k + 1] if k + 1 < release_t.size else np.inf
+        naive.append(sum(1 for b in bug_days if t_release <= b < t_next))
+    reference = time.perf_counter() - start
+
+    print(f'{n} commits, {bugs} bugs, {len(out["release"]) - 1} releases, {len(refs)} references, {correlation.fix_bug.size} links')
+    print(f'scan, one precompiled pattern:  {scan:8.3f} s')
+    print(f'scan, every pattern separately: {loop:8.3f} s')
+    print(f'hash joins:                     {link:8.3f} s')
+    print(f'release metrics:                {releases:8.3f} s')
+    print(f'bugs per release in a loop:     {reference:8.3f} s')
+    print(f'churn vs bugs correlation: {correlation.correlation():.3f}')
+
+def bench_rolling(args):
+    # Commit table of a large project with a tag every 500 commits
+    rng = np.random.default_rng(0)
+    n = 300000
+    timestamp = 16000 + np.cumsum(rng.uniform(0, 0.02, n))
+    tag = np.where(np.arange(n) % 500 == 499, np.char.add('v', np.arange(n).astype(str)), '')
+    table = CommitTable({'commit_id': np.arange(n).astype(str), 'author': rng.integers(0, 300, n).astype(str),
+                         'date': np.full(n, ''), 'changed_files': rng.integers(1, 10, n),
+                         'lines_added': rng.integers(0, 100, n), 'lines_deleted': rng.integers(0, 50, n),
+                         'tag': tag, 'timestamp': timestamp})
+    for label, kwargs in (('tags', {}), ('daily grid', {'step': 1.0})):
+        start = time.perf_counter()
+        out = table.rolling(90, quantiles=(), **kwargs)
+        rolling = time.perf_counter() - start
+        start = time.perf_counter()
+        table.rolling(90, **kwargs)
+        quantiles = time.perf_counter() - start
+
+        # Masks over the whole history per evaluation time, compared in tests/test_commit_table.py
+        start = time.perf_counter()
+        lines_altered = table.lines_altered
+        for t in out['t']:
+            m = (table.timestamp > t - 90) & (table.timestamp <= t)
+            lines_altered[m].sum()
+            np.unique(table.author[m])
+        reference = time.perf_counter() - start
+        print(f'{label:10s} {out["t"].size:6d} windows: rolling {rolling:8.3f} s, with medians {quantiles:8.3f} s, '
+              f'masks {reference:8.3f} s')
+
+BENCHMARKS = {
+    'batch': bench_batch,
+    'blame': bench_blame,
+    'bugexport': bench_bugexport,
+    'bugzilla': bench_bugzilla,
+    'commits': bench_commits,
+    'correlation': bench_correlation,
+    'faultscore': bench_faultscore,
+    'history': bench_history,
+    'ingest': bench_ingest,
+    'lifetimes': bench_lifetimes,
+    'parallel': bench_parallel,
+    'render': bench_render,
+    'rolling': bench_rolling,
+    'steadystate': bench_steadystate,
+    'survival': bench_survival,
+    'table': bench_table,
+    'tracker': bench_tracker,
+    'weibull': bench_weibull,
+}
+
+def main(args):
+    BENCHMARKS[args.bench](args)
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -1,16 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+import hashlib
+import io
+import json
+import os
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 
 import numpy as np
 from reliability.Distributions import Weibull_Distribution
 from reliability.Probability_plotting import plot_points
 import matplotlib.pyplot as plt
-from reliability.Probability_plotting import plotting_positions
+from scipy.stats import norm
+
+
+# From Busybox's mainpage, the releases and their dates
+RELEASES = [
+    ("1.36.0", "3 January 2023"),
+    ("1.35.0", "26 December 2021"),
+    ("1.33.2", "30 November 2021"),
+    ("1.34.1", "30 September 2021"),
+    ("1.34.0", "19 August 2021"),
+    ("1.33.1", "3 May 2021"),
+    ("1.32.1", "1 January 2021"),
+    ("1.33.0", "29 December 2020"),
+    ("1.32.0", "26 June 2020"),
+    ("1.31.1", "25 October 2019"),
+    ("1.31.0", "10 June 2019"),
+    ("1.30.1", "14 February 2019"),
+    ("1.30.0", "31 December 2018"),
+    ("1.29.3", "9 September 2018"),
+    ("1.29.2", "31 July 2018"),
+    ("1.29.1", "15 July 2018"),
+    ("1.29.0", "1 July 2018"),
+    ("1.28.4", "22 May 2018"),
+    ("1.28.3", "3 April 2018"),
+    ("1.28.2", "26 March 2018"),
+    ("1.28.1", "15 February 2018"),
+    ("1.28.0", "2 January 2018"),
+    ("1.27.2", "17 August 2017"),
+    ("1.27.1", "18 July 2017"),
+    ("1.27.0", "3 July 2017"),
+    ("1.26.2", "10 January 2017"),
+    ("1.26.1", "2 January 2017"),
+    ("1.26.0", "20 December 2016"),
+    ("1.25.1", "7 October 2016"),
+    ("1.25.0", "22 June 2016"),
+    ("1.24.2", "24 March 2016"),
+    ("1.24.1", "24 October 2015"),
+    ("1.24.0", "12 October 2015"),
+    ("1.23.2", "23 March 2015"),
+    ("1.23.1", "27 January 2015"),
+    ("1.23.0", "23 December 2014"),
+    ("1.22.1", "20 January 2014"),
+    ("1.22.0", "1 January 2014"),
+    ("1.21.1", "29 June 2013"),
+    ("1.21.0", "21 January 2013"),
+    ("1.20.2", "2 July 2012"),
+]
 
 
 class Bugzilla:
-    def __init__(self, host):
+    modes = ["rest", "csv", "html"]
+
+    def __init__(
+        self, host, workers=8, cache_dir=None, timeout=60, mode="auto", page_size=1000
+    ):
+        """
+        :param host: Bugzilla URL ending with a slash
+        :param workers: size of the connection pool shared by the fetching threads
+        :param cache_dir: directory for the raw responses, no caching when None
+        :param timeout: timeout of a request in seconds
+        :param mode: export used by fetch_opened: "rest" (/rest/bug JSON), "csv"
+            (buglist.cgi ctype=csv), "html" (buglist.cgi page) or "auto" - the first
+            of them that works, in this order
+        :param page_size: bugs per /rest/bug request
+        """
         self.host = host
         self.param_base = (
             "buglist.cgi?bug_status=UNCONFIRMED&bug_status=NEW"
@@ -18,11 +85,70 @@ class Bugzilla:
             "&bug_status=VERIFIED&bug_status=CLOSED&chfield=%5BBug%20creation%5D"
             "&chfieldfrom={date_from}&chfieldto={date_to}&columnlist=product%2Ccomponent%2Cassigned_to%2Cbug_status%2Cresolution%2Cshort_desc%2Cchangeddate%2Copendate&f1=version&o1=substring&product=Busybox&query_format=advanced&v1={version}"
         )
+        # The same search with the opening date column only and no row limit
+        self.param_csv = (
+            "buglist.cgi?bug_status=UNCONFIRMED&bug_status=NEW"
+            "&bug_status=ASSIGNED&bug_status=REOPENED&bug_status=RESOLVED"
+            "&bug_status=VERIFIED&bug_status=CLOSED&chfield=%5BBug%20creation%5D"
+            "&chfieldfrom={date_from}&chfieldto={date_to}&columnlist=opendate&ctype=csv&limit=0&f1=version&o1=substring&product=Busybox&query_format=advanced&v1={version}"
+        )
+        # Creation date range as search criteria, the end date is inclusive as in chfieldto
+        self.param_rest = (
+            "rest/bug?product=Busybox&include_fields=id%2Ccreation_time"
+            "&f1=version&o1=substring&v1={version}"
+            "&f2=creation_ts&o2=greaterthaneq&v2={date_from}"
+            "&f3=creation_ts&o3=lessthan&v3={date_after}"
+            "&order=bug_id&limit={limit}&offset={offset}"
+        )
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.mode = mode
+        self.page_size = page_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
-    def request(self, params: str) -> list[pd.DataFrame]:
+    def get(self, params: str) -> str:
         url = self.host + params
-        resp = requests.get(url)
-        return pd.read_html(resp.text)
+        resp = self.session.get(url, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.text
+
+    def request(self, params: str) -> list[pd.DataFrame]:
+        return pd.read_html(io.StringIO(self.get(params)))
+
+    def cache_path(self, *key: str) -> str | None:
+        if self.cache_dir is None:
+            return None
+        name = hashlib.sha1("\x1f".join((self.host,) + key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.html")
+
+    def fetch_text(self, params: str, key: tuple, _to: str) -> str:
+        """
+        Raw response of params, cached on disk by key. Periods ending today or later
+        are not cached as they can still change.
+        """
+        path = self.cache_path(*key)
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        text = self.get(params)
+        if path is not None and _to < str(datetime.today().date()):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        return text
+
+    def fetch_page(self, _from: str, _to: str, version: str) -> str:
+        """
+        Raw buglist page of the bugs created from _from to _to (dates), cached on disk
+        by (version, from, to)
+        """
+        params = self.param_base.format(date_from=_from, date_to=_to, version=version)
+        return self.fetch_text(params, (version, _from, _to), _to)
 
     def fetch_bugs(
         self, _from: datetime, _to: datetime, version: str
@@ -36,8 +162,83 @@ class Bugzilla:
         _from = str(_from.date())
         _to = str(_to.date())
 
-        params = self.param_base.format(date_from=_from, date_to=_to, version=version)
-        return self.request(params)
+        return pd.read_html(io.StringIO(self.fetch_page(_from, _to, version)))
+
+    def fetch_opened(
+        self, _from: datetime, _to: datetime, version: str
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Ids and opening timestamps (UTC seconds of the opening day, as
+        CraftBench.transform_timestamp) of the bugs created from _from to _to
+        :param _from: search from date
+        :param _to: search to date
+        :param version: version of product
+        """
+        modes = Bugzilla.modes if self.mode == "auto" else [self.mode]
+        error = None
+        for mode in modes:
+            try:
+                result = getattr(self, f"fetch_opened_{mode}")(
+                    str(_from.date()), str(_to.date()), version
+                )
+            except Exception as ex:
+                error = ex
+                continue
+            if self.mode == "auto":
+                # The export that worked is used for the next requests
+                self.mode = mode
+            return result
+        raise error
+
+    def fetch_opened_rest(self, _from: str, _to: str, version: str):
+        date_after = str((datetime.strptime(_to, "%Y-%m-%d") + timedelta(days=1)).date())
+        ids = []
+        opened = []
+        offset = 0
+        while True:
+            params = self.param_rest.format(
+                version=version,
+                date_from=_from,
+                date_after=date_after,
+                limit=self.page_size,
+                offset=offset,
+            )
+            text = self.fetch_text(params, ("rest", version, _from, _to, str(offset)), _to)
+            bugs = json.loads(text)["bugs"]
+            ids.extend(b["id"] for b in bugs)
+            opened.extend(b["creation_time"] for b in bugs)
+            if len(bugs) < self.page_size:
+                break
+            offset += len(bugs)
+        return np.array(ids, dtype=np.int64), Bugzilla.day_timestamps(opened)
+
+    def fetch_opened_csv(self, _from: str, _to: str, version: str):
+        params = self.param_csv.format(date_from=_from, date_to=_to, version=version)
+        text = self.fetch_text(params, ("csv", version, _from, _to), _to)
+        bugs = pd.read_csv(
+            io.StringIO(text), usecols=["bug_id", "opendate"], dtype={"bug_id": np.int64, "opendate": str}
+        )
+        return bugs["bug_id"].to_numpy(), Bugzilla.day_timestamps(bugs["opendate"])
+
+    def fetch_opened_html(self, _from: str, _to: str, version: str):
+        fetched_bugs = pd.read_html(io.StringIO(self.fetch_page(_from, _to, version)))
+        if not fetched_bugs:
+            raise Exception("Failed to parse Bugzilla")
+        bug_list = fetched_bugs[0]
+        return bug_list.ID.to_numpy(dtype=np.int64), Bugzilla.day_timestamps(bug_list.Opened)
+
+    @staticmethod
+    def day_timestamps(values) -> np.ndarray:
+        """
+        UTC timestamps of the days of "%Y-%m-%d..." strings, the buglist page shows only
+        the time for the bugs opened today, these get the current time (as before)
+        """
+        days = pd.to_datetime(
+            pd.Series(values, dtype=str).str[:10], format="%Y-%m-%d", errors="coerce"
+        )
+        stamps = (days.to_numpy(dtype="datetime64[s]").astype(np.int64)).astype(float)
+        today = datetime.today().replace(tzinfo=timezone.utc).timestamp()
+        return np.where(days.isna().to_numpy(), today, stamps)
 
 
 class CraftBench:
@@ -54,43 +255,211 @@ class CraftBench:
                 dt = datetime.today()
         return dt.replace(tzinfo=timezone.utc).timestamp()
 
+    def fetch_window(self, window: tuple, version: str):
+        """
+        Ids and opening timestamps of the bugs of a (from, to) window or the exception raised
+        while fetching it
+        """
+        try:
+            return self.bsc.fetch_opened(_from=window[0], _to=window[1], version=version)
+        except Exception as ex:
+            return ex
+
     def prepare_time_series(
-        self, version: str, from_date: datetime, to_date: datetime, step_days
+        self,
+        version: str,
+        from_date: datetime,
+        to_date: datetime,
+        step_days,
+        workers=8,
+        adaptive=False,
+        max_results=500,
+        min_results=50,
     ) -> list:
+        """
+        Opening timestamps of the bugs of a version, walking back from from_date to to_date
+        in windows of step_days fetched concurrently, the walk stops at the first empty window.
+        Every bug is taken once (by id), also when it is on the common day of two windows.
+        :param workers: windows fetched at the same time
+        :param adaptive: widen the windows while they bring fewer than min_results bugs and
+            narrow them above max_results / 2, windows with max_results bugs (the buglist
+            limit) are split in two halves without a common day and fetched again
+        """
         time_series = []
+        seen = set()
+        step = step_days
         chunk = -1
-        while True:
-            chunk += 1
-            _from = from_date - timedelta(days=step_days * chunk + step_days)
-            _to = from_date - timedelta(days=step_days * chunk)
+        _to = from_date
+        done = False
+        with ThreadPoolExecutor(workers) as pool:
+            while not done:
+                # The next round of windows
+                windows = []
+                while len(windows) < workers:
+                    _from = _to - timedelta(days=step)
+                    if (_from - to_date).days <= 0:
+                        if adaptive and step > step_days:
+                            # Back to step_days windows at the end of the period
+                            step = step_days
+                            continue
+                        done = True
+                        break
+                    windows.append((_from, _to))
+                    _to = _from
+                if not windows:
+                    break
+                counts = []
+                pending = [
+                    (w, pool.submit(self.fetch_window, w, version), False)
+                    for w in windows
+                ]
+                while pending:
+                    [window, future, split] = pending.pop(0)
+                    result = future.result()
+                    chunk += 1
+                    if isinstance(result, Exception):
+                        print("Failed to fetch data from Bugzilla:")
+                        print(result)
+                        print(window[0], window[1])
+                        continue
+                    [ids, opened] = result
+                    days = (window[1] - window[0]).days
+                    if adaptive and opened.size >= max_results and days >= 1:
+                        # Truncated, split in two windows without a common day (the dates are
+                        # inclusive), the newer half first
+                        middle = window[1] - timedelta(days=days // 2)
+                        halves = [(middle, window[1]), (window[0], middle - timedelta(days=1))]
+                        pending[:0] = [
+                            (w, pool.submit(self.fetch_window, w, version), True)
+                            for w in halves
+                        ]
+                        continue
+                    if opened.size == 0:
+                        if split:
+                            # The bugs are in the other half
+                            continue
+                        done = True
+                        break
+                    counts.append(opened.size)
+                    # Neighbouring windows share their boundary day, every bug is taken once
+                    new = np.array([i not in seen for i in ids.tolist()], dtype=bool)
+                    seen.update(ids.tolist())
+                    timestamps = opened[new].tolist()
+                    print(chunk, window[0], timestamps)
+                    time_series.extend(timestamps)
+                for _, future, _ in pending:
+                    future.cancel()
+                if adaptive and counts:
+                    average = sum(counts) / len(counts)
+                    if average < min_results:
+                        step = step * 2
+                    elif average > max_results / 2:
+                        step = max(1, step // 2)
+        return sorted(time_series)
 
-            if (_from - to_date).days <= 0:
-                break
-            try:
-                fetched_bugs = self.bsc.fetch_bugs(
-                    _from=_from, _to=_to, version=version
-                )
-            except Exception as ex:
-                print("Failed to fetch data from Bugzilla:")
-                print(ex)
-                print(_from, _to)
-                continue
-            if not fetched_bugs:
-                Exception("Failed to parse Bugzilla")
+    @staticmethod
+    def fit_weibull_batch(
+        series: dict, confidence=0.95, iterations=100, tol=1e-10
+    ) -> pd.DataFrame:
+        """
+        Weibull fits of many failure time series at once, one row per series. The series are
+        padded into one array, alpha/beta come from the rank regression on the median rank
+        plotting positions (as in do_research) and from maximum likelihood with Newton
+        iterations on beta for all the series together, the bounds of the MLE parameters from
+        the observed Fisher information. Times <= 0 are left out, series with fewer than two
+        distinct times get NaN parameters.
+        :param series: {version: failure times}, e.g. bug opening times since the release
+        :param confidence: two-sided confidence level of the bounds
+        """
+        names = list(series)
+        samples = [np.asarray(series[k], dtype=float).ravel() for k in names]
+        samples = [x[np.isfinite(x) & (x > 0)] for x in samples]
+        n = np.array([x.size for x in samples], dtype=np.int64)
+        width = max(int(n.max()) if n.size else 0, 1)
+        mask = np.arange(width) < n[:, None]
+        t = np.full((len(names), width), np.inf)
+        if n.sum() > 0:
+            t[mask] = np.concatenate(samples)
+        t.sort(axis=1)
+        count = np.maximum(n, 1)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            # Rank regression of ln(-ln(1 - F)) on ln(t), F = (i - 0.3) / (n + 0.4)
+            F = (np.arange(1, width + 1) - 0.3) / (n[:, None] + 0.4)
+            x = np.where(mask, np.log(t), 0.0)
+            y = np.where(mask, np.log(-np.log(1 - F)), 0.0)
+            dx = np.where(mask, x - (x.sum(axis=1) / count)[:, None], 0.0)
+            m = (dx * y).sum(axis=1) / (dx * dx).sum(axis=1)
+            intercept = (y.sum(axis=1) - m * x.sum(axis=1)) / count
+            beta_rr = m
+            alpha_rr = np.exp(-intercept / m)
 
-            bug_list = fetched_bugs[0]
-            if bug_list.shape[0] == 0:
-                break
-            timestamps = [
-                self.transform_timestamp(x) for x in bug_list.Opened.to_list()
-            ]
-            print(chunk, _from, timestamps)
-            time_series.extend(timestamps)
-        return sorted(time_series)
+            # Maximum likelihood, times scaled by the series maximum so that x**beta stays finite
+            scale = np.where(n > 0, np.where(mask, t, 0.0).max(axis=1), 1.0)
+            lx = np.where(mask, np.log(t / scale[:, None]), 0.0)
+            fit = (n > 1) & ((dx * dx).sum(axis=1) > 0)
+            a = lx.sum(axis=1) / count
+            beta = np.ones(len(names))
+            for i in range(iterations):
+                xb = np.where(mask, np.exp(beta[:, None] * lx), 0.0)
+                c = xb.sum(axis=1)
+                b = (xb * lx).sum(axis=1)
+                e = (xb * lx * lx).sum(axis=1)
+                c = np.where(c > 0, c, 1)
+                f = 1 / beta + a - b / c
+                df = -1 / beta**2 - (e * c - b * b) / c**2
+                beta_new = np.where(fit, beta - f / df, beta)
+                # Keep the shape positive
+                beta_new = np.where(beta_new > 0, beta_new, beta / 2)
+                converged = np.all(np.abs(beta_new - beta) <= tol * beta)
+                beta = beta_new
+                if converged:
+                    break
+            c = np.where(mask, np.exp(beta[:, None] * lx), 0.0).sum(axis=1)
+            alpha = scale * (c / count) ** (1 / beta)
+
+            # Observed information of (alpha, beta), bounds on the log scale
+            lu = np.where(mask, np.log(t / alpha[:, None]), 0.0)
+            z = np.where(mask, np.exp(beta[:, None] * lu), 0.0)
+            sz = z.sum(axis=1)
+            szl = (z * lu).sum(axis=1)
+            szll = (z * lu * lu).sum(axis=1)
+            i_aa = (beta * (beta + 1) * sz - n * beta) / alpha**2
+            i_bb = n / beta**2 + szll
+            i_ab = (n - sz - beta * szl) / alpha
+            det = i_aa * i_bb - i_ab**2
+            se_alpha = np.sqrt(i_bb / det)
+            se_beta = np.sqrt(i_aa / det)
+        q = norm.ppf(0.5 + confidence / 2)
+        nan = np.full(len(names), np.nan)
+        rr = n > 1
+        k_alpha = np.exp(q * se_alpha / alpha)
+        k_beta = np.exp(q * se_beta / beta)
+        return pd.DataFrame(
+            {
+                "version": names,
+                "n": n,
+                "alpha_rr": np.where(rr, alpha_rr, nan),
+                "beta_rr": np.where(rr, beta_rr, nan),
+                "alpha": np.where(fit, alpha, nan),
+                "beta": np.where(fit, beta, nan),
+                "alpha_lower": np.where(fit, alpha / k_alpha, nan),
+                "alpha_upper": np.where(fit, alpha * k_alpha, nan),
+                "beta_lower": np.where(fit, beta / k_beta, nan),
+                "beta_upper": np.where(fit, beta * k_beta, nan),
+            }
+        )
 
     def do_research(
-        self, version: str, from_date: datetime, to_date: datetime, step_days=7
+        self,
+        version: str,
+        from_date: datetime,
+        to_date: datetime,
+        step_days=7,
+        output=None,
     ):
+        """
+        :param output: save the probability plot to this file instead of showing it
+        """
         data = self.prepare_time_series(
             version=version,
             from_date=from_date,
@@ -99,80 +468,71 @@ class CraftBench:
         )
         to_date_ts = self.transform_timestamp(to_date)
         normalized = [x - to_date_ts for x in data]
-        # plotting positions
-        t, F = plotting_positions(failures=normalized)
-        print("t =", t)
-        print("F =", F)
-
-        # forward transform
-        x = np.log(t)
-        y = np.log(-np.log(1 - F))
-        m, c = np.polyfit(x, y, 1)
-        print("m =", m)
-        print("c =", c)
-
-        # reverse transform
-        beta = m
-        alpha = np.exp(-c / beta)
-        print("alpha =", alpha)
-        print("beta =", beta)
+        fit = self.fit_weibull_batch({version: normalized}).iloc[0]
+        print("alpha =", fit["alpha_rr"])
+        print("beta =", fit["beta_rr"])
 
         plot_points(failures=normalized, marker="o")
-        Weibull_Distribution(alpha=alpha, beta=beta).CDF()
-        plt.show()
+        Weibull_Distribution(alpha=fit["alpha_rr"], beta=fit["beta_rr"]).CDF()
+        if output:
+            plt.savefig(output)
+            plt.close()
+        else:
+            plt.show()
+
+    def research_releases(
+        self, releases=RELEASES, from_date=None, step_days=7, workers=8, output=None
+    ) -> pd.DataFrame:
+        """
+        Weibull parameters of the bug opening times (days since the release) of every release,
+        the bugs are queried by the major.minor version as in do_research, all the walks start
+        at the same from_date so the releases of a series share their cached windows
+        :param releases: [(version, "%d %B %Y" release date)], the releases of Busybox by default
+        :param output: save the alpha/beta plot to this file, nothing is shown
+        """
+        from_date = from_date if from_date is not None else datetime.today()
+        series = {}
+        dates = []
+        for version, date in releases:
+            to_date = datetime.strptime(date, "%d %B %Y")
+            data = self.prepare_time_series(
+                version=".".join(version.split(".")[:2]),
+                from_date=from_date,
+                to_date=to_date,
+                step_days=step_days,
+                workers=workers,
+            )
+            to_date_ts = self.transform_timestamp(to_date)
+            series[version] = [(x - to_date_ts) / (24 * 3600) for x in data]
+            dates.append(to_date)
+        table = self.fit_weibull_batch(series)
+        table.insert(1, "release_date", dates)
+        if output:
+            # Only the fitted releases, with the distances to their bounds as error bars
+            fig, axes = plt.subplots(2, 1, sharex=True)
+            fitted = table[table["beta"].notna()]
+            for ax, p in zip(axes, ["alpha", "beta"]):
+                lower = fitted[p] - fitted[f"{p}_lower"]
+                upper = fitted[f"{p}_upper"] - fitted[p]
+                ax.errorbar(
+                    fitted["release_date"], fitted[p], yerr=[lower, upper], fmt="o"
+                )
+                ax.set_ylabel(p + (" [days]" if p == "alpha" else ""))
+                ax.grid(True)
+            fig.savefig(output)
+            plt.close(fig)
+        return table
 
 
 if __name__ == "__main__":
-    """
-    From Busybox's mainpage, the releases and their dates are the following:
-
-    3 January 2023 -- BusyBox 1.36.0
-    26 December 2021 -- BusyBox 1.35.0
-    30 November 2021 -- BusyBox 1.33.2
-    30 September 2021 -- BusyBox 1.34.1
-    19 August 2021 -- BusyBox 1.34.0
-    3 May 2021 -- BusyBox 1.33.1
-    1 January 2021 -- BusyBox 1.32.1
-    29 December 2020 -- BusyBox 1.33.0
-    26 June 2020 -- BusyBox 1.32.0
-    25 October 2019 -- BusyBox 1.31.1
-    10 June 2019 -- BusyBox 1.31.0
-    14 February 2019 -- BusyBox 1.30.1
-    31 December 2018 -- BusyBox 1.30.0
-    9 September 2018 -- BusyBox 1.29.3
-    31 July 2018 -- BusyBox 1.29.2
-    15 July 2018 -- BusyBox 1.29.1
-    1 July 2018 -- BusyBox 1.29.0
-    22 May 2018 -- BusyBox 1.28.4
-    3 April 2018 -- BusyBox 1.28.3
-    26 March 2018 -- BusyBox 1.28.2
-    15 February 2018 -- BusyBox 1.28.1
-    2 January 2018 -- BusyBox 1.28.0
-    17 August 2017 -- BusyBox 1.27.2
-    18 July 2017 -- BusyBox 1.27.1
-    3 July 2017 -- BusyBox 1.27.0
-    10 January 2017 -- BusyBox 1.26.2
-    2 January 2017 -- BusyBox 1.26.1
-    20 December 2016 -- BusyBox 1.26.0
-    7 October 2016 -- BusyBox 1.25.1
-    22 June 2016 -- BusyBox 1.25.0
-    24 March 2016 -- BusyBox 1.24.2
-    24 October 2015 -- BusyBox 1.24.1
-    12 October 2015 -- BusyBox 1.24.0
-    23 March 2015 -- BusyBox 1.23.2
-    27 January 2015 -- BusyBox 1.23.1
-    23 December 2014 -- BusyBox 1.23.0
-    20 January 2014 -- BusyBox 1.22.1
-    1 January 2014 -- BusyBox 1.22.0
-    29 June 2013 -- BusyBox 1.21.1
-    21 January 2013 -- BusyBox 1.21.0
-    2 July 2012 -- BusyBox 1.20.2
-    """
-    bugzilla = Bugzilla(host="https://bugs.busybox.net/")
+    # Raw responses are kept in bugzilla/.cache, the next runs fetch only the recent weeks
+    bugzilla = Bugzilla(
+        host="https://bugs.busybox.net/",
+        cache_dir=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+    )
     bench = CraftBench(bugzilla=bugzilla)
-    # we take release date of 1.35 and put feed it to the craft bench
-    bench.do_research(
-        version="1.35",
-        from_date=datetime.today(),
-        to_date=datetime.strptime("26 December 2021", "%d %B %Y"),
+    # Stabilization parameters of every release, the figure is saved next to this script
+    table = bench.research_releases(
+        output=os.path.join(os.path.dirname(os.path.abspath(__file__)), "weibull.png")
     )
+    print(table.to_string(index=False))
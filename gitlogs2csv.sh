@@ -1,7 +1,5 @@
 #! /bin/bash
 
-OUTFILE="data/output.csv"
-
 # Input checks
 if [ $# -eq 0 ]
 then
@@ -9,6 +7,8 @@ then
     exit 1
 fi
 GITREPO=$1
+# Optional output file, so that several repositories can be exported at the same time
+OUTFILE=${2:-data/output.csv}
 echo "GITLOG2CSV" 
 echo "Processing repository in directory:" $GITREPO
 echo "┏━━━━━"
@@ -30,27 +30,23 @@ fi
 # Main
 echo -ne "┣ getting git tags ... "
 declare -A TAGS
-for TAG in $(git tag) ; do
-    
-    COMMIT_ID_RAW=$(git rev-list -n 1 $TAG)
-    # 10
-    COMMIT_ID=$(echo $COMMIT_ID_RAW | cut -c1-10)
-    TAGS[$COMMIT_ID]=$TAG
-    # 9
-    COMMIT_ID=$(echo $COMMIT_ID_RAW | cut -c1-9)
-    TAGS[$COMMIT_ID]=$TAG
-    # 8 
-    COMMIT_ID=$(echo $COMMIT_ID_RAW | cut -c1-8)
-    TAGS[$COMMIT_ID]=$TAG
-    # 7
-    COMMIT_ID=$(echo $COMMIT_ID_RAW | cut -c1-7)
-    TAGS[$COMMIT_ID]=$TAG
-done
+# One call for all tags, "^{}" lines (peeled annotated tags) come after and win
+while read COMMIT_ID_RAW REF; do
+    TAG=${REF#refs/tags/}
+    TAG=${TAG%^\{\}}
+    # 10, 9, 8, 7
+    TAGS[${COMMIT_ID_RAW:0:10}]=$TAG
+    TAGS[${COMMIT_ID_RAW:0:9}]=$TAG
+    TAGS[${COMMIT_ID_RAW:0:8}]=$TAG
+    TAGS[${COMMIT_ID_RAW:0:7}]=$TAG
+done < <(git show-ref --tags -d)
 echo "done (${#TAGS[@]} tags)"
 
 
 echo -ne "┣ exporting git history to $OUTFILE ... "
-OUTFILE="$original_dir/$OUTFILE"
+if [[ $OUTFILE != /* ]]; then
+    OUTFILE="$original_dir/$OUTFILE"
+fi
 echo "commit_id,author,date,changed_files,lines_added,lines_deleted,tag" > $OUTFILE 
 git log --all --shortstat --reverse --date=local --date=format-local:'%Y-%m-%d %H:%M:%S' --pretty="@%h,%an,%ad," \
     | tr "\n" " " | tr "@" "\n" | while read LINE; do
@@ -78,8 +74,8 @@ git log --all --shortstat --reverse --date=local --date=format-local:'%Y-%m-%d %
         LINE="$LINE,"
     fi
 
-    if [[ $(echo $LINE | tr -cd , | wc -c) == 6 ]]; then
-        # Output only good lines = 7 fields
+    if [[ $(echo $LINE | tr -cd , | wc -c) -ge 6 ]]; then
+        # Output only good lines = 7 fields, more when the author has commas (joined back by CommitTable)
         echo $LINE >> $OUTFILE
     fi
 done
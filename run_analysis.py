@@ -1,11 +1,6 @@
-import matplotlib 
-matplotlib.use("TkAgg")
-import matplotlib.pyplot as matplt
-
 import numpy as np
-import statistics
 import pickle
-import math
+import time
 import argparse
 
 from GitAnalysis import *
@@ -21,8 +16,113 @@ def parse_args():
         action="store_true",
         default=False
     )
+    parser.add_argument(
+        "--repo",
+        help="Read the commit history directly from a Git repository instead of data/output.csv",
+        dest="repo",
+        default=None
+    )
+    parser.add_argument(
+        "--kernel",
+        help="Fault score as the convolution of the commit sizes with this decay kernel",
+        dest="kernel",
+        choices=['exponential', 'weibull', 'empirical'],
+        default=None
+    )
+    parser.add_argument(
+        "--alpha",
+        help="Decay rate [1/days] of the exponential kernel or scale [days] of the Weibull kernel (alpha of bugzilla/busybox.py research_releases)",
+        dest="alpha",
+        type=float,
+        default=None
+    )
+    parser.add_argument(
+        "--beta",
+        help="Shape of the Weibull kernel",
+        dest="beta",
+        type=float,
+        default=1.0
+    )
+    parser.add_argument(
+        "--samples",
+        help="File with fault discovery times [days], one per line, for the empirical kernel",
+        dest="samples",
+        default=None
+    )
+    parser.add_argument(
+        "--output",
+        help="Save the figure to this PNG/SVG file instead of showing it (needed without a display)",
+        dest="output",
+        default=None
+    )
+    parser.add_argument(
+        "--batch",
+        help="Export and analyse all these repositories in parallel, the summary goes to data/summary.csv",
+        dest="batch",
+        nargs='+',
+        default=None
+    )
+    parser.add_argument(
+        "--processes",
+        help="Number of worker processes for --batch and --sweep (default: number of CPUs)",
+        dest="processes",
+        type=int,
+        default=None
+    )
+    parser.add_argument(
+        "--sweep",
+        help="Print the stable releases for every combination of --min-dt, --relative-band and attribute instead of plotting",
+        dest="sweep",
+        action="store_true",
+        default=False
+    )
+    parser.add_argument(
+        "--min-dt",
+        help="Minimal steady-state duration(s) [days] for --sweep",
+        dest="min_dt",
+        type=float,
+        nargs='+',
+        default=[30, 60, 90, 180]
+    )
+    parser.add_argument(
+        "--relative-band",
+        help="Relative band(s) of the steady state for --sweep",
+        dest="relative_band",
+        type=float,
+        nargs='+',
+        default=[0.001, 0.0025, 0.005, 0.01]
+    )
+    parser.add_argument(
+        "--rolling",
+        help="Print the churn and authors of this many days before every tag (or every --step days) instead of plotting, saved to data/rolling.csv",
+        dest="rolling",
+        type=float,
+        default=None
+    )
+    parser.add_argument(
+        "--step",
+        help="Evaluate --rolling on a regular grid of this many days instead of at the tags",
+        dest="step",
+        type=float,
+        default=None
+    )
     return parser.parse_args()
 
+def get_kernel(args):
+    if args.kernel == 'exponential':
+        # After 30 days, 5% bugs are left as in GitAnalysis.plot2
+        alfa = args.alpha if args.alpha is not None else -1.0 * np.log(0.05) / 30
+        return ExponentialKernel(alfa)
+    elif args.kernel == 'weibull':
+        if args.alpha is None:
+            raise Exception('Weibull kernel needs --alpha (and --beta)!')
+        return WeibullKernel(args.alpha, args.beta)
+    elif args.kernel == 'empirical':
+        if args.samples is None:
+            raise Exception('Empirical kernel needs --samples!')
+        return EmpiricalKernel.from_samples(np.loadtxt(args.samples, ndmin=1))
+    return None
+
 def main_experimental(args):
     print("GIT ANALYSIS - MAIN EXPERIMENTAL")
     test = GitCommit2('./tests/clones/jemalloc/')
@@ -30,51 +130,50 @@ def main_experimental(args):
     # test = GitCommit2('./../fitness_scoring/git-log-testing/')
     # test.get_altered_lines('c7805f1e')
     # test.get_altered_lines('f7436907')
-    commits = test.get_all_commits()
+    # Commits are streamed, tracking starts before the whole history is collected
+    commits = test.iter_commits()
     tags = test.get_all_tags()
-    print(commits[0]['id'])
     # dt_start = commits[0].values["date"]
     datafile = 'jemalloc.data'
     # datafile = 'cryptsetup.data'
     # altered_lines = test.get_altered_lines(commit_ids[0])
+    # Tracker state is kept between the runs, only new commits are processed
+    store = TrackerStore('jemalloc.sqlite')
 
-    [stats, tracker_history] = test.track(commits, tags)
+    # Snapshots at the releases only, the other commits are rebuilt from the closest release
+    [stats, tracker_history] = test.track(commits, tags, snapshots='release', store=store)
+    store.close()
 
+    # Stats as memory mapped columns, the history shares its nodes so the pickle stays small
+    Cache.save_stats(stats, f'{datafile}.stats')
     with open(datafile, 'wb') as f:
-        pickle.dump([stats, tracker_history], f)
+        pickle.dump(tracker_history, f)
 
+    # stats = Cache.load_stats(f'{datafile}.stats')
     # with open(datafile, 'rb') as f:
-    #     [stats, tracker_history] = pickle.load(f)
-
-    tmin = min([x['timestart'] for x in stats])
-    tmax = max([x['timeend'] for x in stats])
-
-    tstep = 24*3600*30
-
-    tx = range(math.floor(tmin), math.floor(tmax), tstep)
-    ty = []
-    y = []
-    for t in tx:
-        tspans = []
-        for i, s in enumerate(stats):
-            if t > s['timeend']:
-                del stats[i]
-            elif t >= s['timestart'] and t <= s['timeend']:
-                if s['timespan'] >= 0:
-                    tspans.append(s['timespan'])
-        if tspans:    
-            ty.append(t/24/3600)
-            y.append(statistics.median(tspans)/24/3600)     
+    #     tracker_history = pickle.load(f)
 
+    # Median lifetime of the lines alive every 30 days
+    [ty, y] = GitAnalysis.survival_quantiles(stats, 30, [0.5])
+    y = y[:, 0]
 
+    matplt = Render.pyplot()
     [fig, ax] = matplt.subplots()
     ax.plot(ty, y, linewidth=2.0)
 
     matplt.grid(True)
 
-    matplt.show()
     ax.set_xlabel(f'Timestamps since beginning of the project')
     ax.set_ylabel(f'Median time to fix code [days] ')
+    Render.finish(fig, args.output)
+
+    # Line survival per directory, the lines still alive at HEAD are censored
+    if len(tracker_history) > 0:
+        last_commit = tracker_history.keys()[-1]
+        survival = Survival.from_tracking(stats, tracker_history[last_commit]['tracker'], tracker_history.timestamps,
+                                          head_files=test.get_files())
+        for directory, fit in survival.weibull('directory').items():
+            print(f"{directory:40s} lines {fit['lines']:10.0f} deleted {fit['deleted']:10.0f} alpha {fit['alpha']:10.1f} days beta {fit['beta']:6.3f}")
     print('-- end --')
     # alfa = -1.0 * np.log(0.05) / 180 
     # print(GitAnalysis.exponential(180, alfa))
@@ -105,20 +204,45 @@ def main_experimental(args):
 
     # matplt.show()
 
+def main_batch(args):
+    print("GIT ANALYSIS - BATCH")
+    start = time.perf_counter()
+    rows = Batch(args.batch, processes=args.processes).run()
+    Batch.print_summary(rows)
+    Batch.export_csv(rows, 'data/summary.csv')
+    print(f'{len(rows)} repositories in {time.perf_counter() - start:.1f} s, summary saved to data/summary.csv')
+
 def main(args):
     package = ''
     analysis = GitAnalysis(package)
-    if package:
+    if args.repo:
+        analysis.import_git(args.repo)
+    elif package:
         analysis.import_csv(f'data/output_{package}.csv')
     else:
         analysis.import_csv('data/output.csv')
+    if args.sweep:
+        for r in analysis.sweep(args.min_dt, args.relative_band, processes=args.processes):
+            print(f"{r['attr']:15s} min_dt={r['min_dt']:<6g} relative_band={r['relative_band']:<8g} {', '.join(r['stable_releases'])}")
+        return
+    if args.rolling:
+        r = analysis.commits.rolling(args.rolling, step=args.step)
+        print(f'{"tag":16s} {"commits":>8s} {"authors":>8s} {"lines altered":>14s} {"lines weighted":>15s} {"median":>8s}')
+        for k in range(len(r['t'])):
+            # Grid points are labelled by their date
+            label = r['tag'][k] or time.strftime('%Y-%m-%d', time.localtime(r['t'][k]*24*3600))
+            print(f"{label:16s} {r['commits'][k]:8d} {r['authors'][k]:8d} {r['lines_altered_sum'][k]:14.0f} {r['lines_weighted_sum'][k]:15.1f} {r['lines_altered_p50'][k]:8.1f}")
+        CommitTable.export_csv(r, 'data/rolling.csv')
+        return
     # analysis.plot('lines_altered')
     # analysis.plot(90, 0.005, 'lines_weighted')
-    analysis.plot2('lines_altered')
+    analysis.plot2('lines_altered', get_kernel(args), output=args.output)
 
 if __name__ == '__main__':
     args = parse_args()
-    if args.experimental:
+    if args.batch:
+        main_batch(args)
+    elif args.experimental:
         # WIP: experimental analysis with additional features
         main_experimental(args)
     else:
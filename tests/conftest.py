@@ -0,0 +1,14 @@
+import os
+import sys
+
+# The tests import GitAnalysis, bugzilla and tests.helpers from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def synthetic(tmp_path_factory):
+    # Small synthetic repository with renames and tags, see tests.helpers.synthetic_repo
+    from tests.helpers import synthetic_repo
+    return synthetic_repo(str(tmp_path_factory.mktemp('clones') / 'synthetic'), 400, 20, tag_every=25)
@@ -0,0 +1,110 @@
+# Stand-in Bugzilla server and synthetic repository shared by the tests and benchmark.py
+import os
+import json
+import time
+import random
+import http.server
+import urllib.parse
+import subprocess
+
+
+class BuglistHandler(http.server.BaseHTTPRequestHandler):
+    # Stand-in for Bugzilla: the bugs opened in the requested period from buglist.cgi as an HTML
+    # table (at most limit rows) or as CSV (ctype=csv) and from /rest/bug as JSON pages, after
+    # a delay like a remote server. bugs are (id, 'YYYY-MM-DD') sorted by id.
+    bugs = []
+    limit = 500
+    delay = 0.05
+    requests = 0
+    rest = True
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        if url.path == '/rest/bug':
+            if not BuglistHandler.rest:
+                self.send_error(404)
+                return
+            date_from = query['v2'][0]
+            date_after = query['v3'][0]
+            offset = int(query['offset'][0])
+            limit = int(query['limit'][0])
+            rows = [b for b in BuglistHandler.bugs if date_from <= b[1] < date_after][offset:offset + limit]
+            data = json.dumps({'bugs': [{'id': i, 'creation_time': f'{d}T{i % 24:02d}:15:00Z'} for i, d in rows]})
+            content_type = 'application/json'
+        else:
+            date_from = query['chfieldfrom'][0]
+            date_to = query['chfieldto'][0]
+            rows = [b for b in BuglistHandler.bugs if date_from <= b[1] <= date_to]
+            if query.get('ctype') == ['csv']:
+                data = 'bug_id,opendate\n' + ''.join(f'{i},"{d} {i % 24:02d}:15:00"\n' for i, d in rows)
+                content_type = 'text/csv'
+            else:
+                body = ['<html><body><table class="bz_buglist"><tr><th>ID</th><th>Product</th><th>Summary</th><th>Opened</th></tr>']
+                for bug_id, opened in rows[:BuglistHandler.limit]:
+                    body.append(f'<tr><td>{bug_id}</td><td>Busybox</td><td>Bug {bug_id}</td><td>{opened}</td></tr>')
+                body.append('</table></body></html>')
+                data = ''.join(body)
+                content_type = 'text/html'
+        data = data.encode()
+        time.sleep(BuglistHandler.delay)
+        BuglistHandler.requests += 1
+        self.send_response(200)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def synthetic_repo(path, commits, files, tag_every=50, seed=0):
+    # Repository with random line insertions/deletions, renames and tags built by 'git fast-import'
+    path = os.path.abspath(path)
+    if os.path.isdir(os.path.join(path, '.git')):
+        return path
+    os.makedirs(path)
+    subprocess.check_call(['git', 'init', '-q', path])
+    rnd = random.Random(seed)
+    authors = [f'Author {i} <author{i}@example.com>' for i in range(20)]
+    content = {}
+    timestamp = 1420070400
+    stream = []
+    for i in range(1, commits + 1):
+        timestamp += rnd.randint(60, 3*24*3600)
+        ops = []
+        for _ in range(rnd.randint(1, 3)):
+            if not content or (len(content) < files and rnd.random() < 0.1):
+                fn = f'src/file{len(content)}.c'
+                if fn in content:
+                    continue
+                content[fn] = []
+            else:
+                fn = rnd.choice(sorted(content))
+                if rnd.random() < 0.01:
+                    new_fn = fn.replace('.c', f'_{i}.c')
+                    ops.append(f'R {fn} {new_fn}')
+                    content[new_fn] = content.pop(fn)
+                    fn = new_fn
+            lines = content[fn]
+            if lines:
+                start = rnd.randint(0, len(lines) - 1)
+                del lines[start:start + rnd.randint(0, 5 if len(lines) < 400 else 50)]
+            start = rnd.randint(0, len(lines))
+            lines[start:start] = [f'line {i}.{j} {rnd.random()}' for j in range(rnd.randint(0, 12))]
+            data = ''.join(f'{l}\n' for l in lines).encode()
+            ops.append(f'M 100644 inline {fn}\ndata {len(data)}\n{data.decode()}')
+        author = rnd.choice(authors)
+        message = f'Commit {i}'.encode()
+        stream.append(f'commit refs/heads/master\nmark :{i}\n'
+                      f'author {author} {timestamp} +0000\ncommitter {author} {timestamp} +0000\n'
+                      f'data {len(message)}\n{message.decode()}\n' + '\n'.join(ops) + '\n')
+        if i % tag_every == 0:
+            if i % (2*tag_every) == 0:
+                stream.append(f'tag v{i}\nfrom :{i}\ntagger {author} {timestamp} +0000\ndata 0\n')
+            else:
+                stream.append(f'reset refs/tags/v{i}\nfrom :{i}\n')
+    subprocess.run(['git', 'fast-import', '--quiet'], cwd=path, input=''.join(stream).encode(), check=True)
+    subprocess.check_call(['git', 'checkout', '-q', 'master'], cwd=path)
+    return path
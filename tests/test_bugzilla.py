@@ -0,0 +1,86 @@
+import io
+import random
+import datetime
+import threading
+import contextlib
+import http.server
+import numpy as np
+import pytest
+
+from tests.helpers import BuglistHandler
+from bugzilla.busybox import Bugzilla, CraftBench
+
+
+class CappedBugzilla():
+    # fetch_opened over a list of (id, 'YYYY-MM-DD') bugs returning at most limit bugs
+    def __init__(self, bugs, limit=500):
+        self.bugs = bugs
+        self.limit = limit
+
+    def fetch_opened(self, _from, _to, version):
+        rows = [b for b in self.bugs if str(_from.date()) <= b[1] <= str(_to.date())][:self.limit]
+        return np.array([b[0] for b in rows], dtype=np.int64), Bugzilla.day_timestamps([b[1] for b in rows])
+
+
+def prepare(bugzilla, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return CraftBench(bugzilla).prepare_time_series(*args, **kwargs)
+
+
+@pytest.fixture
+def server():
+    rnd = random.Random(0)
+    start_date = datetime.datetime(2019, 1, 1)
+    BuglistHandler.bugs = sorted(
+        (i, str((start_date + datetime.timedelta(days=rnd.randrange(2*365))).date())) for i in range(2000))
+    BuglistHandler.delay = 0
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), BuglistHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}/'
+    httpd.shutdown()
+    BuglistHandler.limit = 500
+
+
+def expected(from_date, to_date, step_days):
+    # The bugs of the period covered by the windows, every bug once
+    _from = from_date
+    while (_from - datetime.timedelta(days=step_days) - to_date).days > 0:
+        _from -= datetime.timedelta(days=step_days)
+    days = [d for i, d in BuglistHandler.bugs if str(_from.date()) <= d <= str(from_date.date())]
+    return sorted(Bugzilla.day_timestamps(days).tolist())
+
+
+@pytest.mark.parametrize('mode', ['html', 'csv', 'rest'])
+def test_prepare_time_series_serial_and_threads(server, mode):
+    BuglistHandler.limit = 10**9
+    from_date = datetime.datetime(2021, 1, 1)
+    to_date = datetime.datetime(2019, 1, 1)
+    reference = expected(from_date, to_date, 7)
+    assert prepare(Bugzilla(server, workers=1, mode=mode), '1.35', from_date, to_date, 7, workers=1) == reference
+    assert prepare(Bugzilla(server, mode=mode), '1.35', from_date, to_date, 7, workers=8) == reference
+
+
+def test_prepare_time_series_adaptive(server):
+    # Truncated windows are split until they fit under the limit
+    BuglistHandler.limit = 40
+    from_date = datetime.datetime(2021, 1, 1)
+    to_date = datetime.datetime(2019, 1, 1)
+    series = prepare(Bugzilla(server, mode='html'), '1.35', from_date, to_date, 7, adaptive=True,
+                     max_results=40, min_results=10)
+    assert series == expected(from_date, to_date, 7)
+
+
+def test_adaptive_split_keeps_the_older_half():
+    # All the bugs in the older half of a truncated window
+    bugs = [(i, '2020-05-30') for i in range(600)]
+    args = ('1', datetime.datetime(2020, 6, 5), datetime.datetime(2020, 5, 1), 7)
+    assert len(prepare(CappedBugzilla(bugs), *args)) == 500
+    assert len(prepare(CappedBugzilla(bugs), *args, adaptive=True)) == 500
+
+
+def test_adaptive_split_takes_every_bug_once():
+    bugs = [(i, '2020-06-01') for i in range(300)] + [(300 + i, '2020-06-02') for i in range(300)] + \
+        [(600 + i, '2020-05-30') for i in range(10)]
+    series = prepare(CappedBugzilla(bugs), '1', datetime.datetime(2020, 6, 5), datetime.datetime(2020, 5, 1), 7,
+                     adaptive=True)
+    assert len(series) == 610
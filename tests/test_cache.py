@@ -0,0 +1,45 @@
+import os
+import pytest
+
+from GitAnalysis import Cache, GitAnalysis, GitLog
+
+
+def write_csv(tmp_path):
+    fn = tmp_path / 'output.csv'
+    fn.write_text(','.join(GitLog.fields) + '\n'
+                  'a1,Ann,2020-01-01 10:00:00,1,5,2,v1\n'
+                  'a2,Bob,2020-01-02 10:00:00,2,3,0,\n')
+    return str(fn)
+
+
+def test_unwritable_cache_is_skipped(tmp_path, monkeypatch):
+    # Read-only data directory, root ignores the permissions so makedirs fails instead
+    fn = write_csv(tmp_path)
+
+    def makedirs(*args, **kwargs):
+        raise PermissionError(13, 'Permission denied')
+    monkeypatch.setattr(os, 'makedirs', makedirs)
+    ga = GitAnalysis('output.csv')
+    with pytest.warns(UserWarning, match='not saved'):
+        ga.import_csv(fn)
+    assert ga.commits.commit_id.tolist() == ['a1', 'a2']
+    assert not os.path.exists(Cache.path(fn))
+    assert not os.path.exists(f'{Cache.path(fn)}.tmp')
+
+
+@pytest.mark.parametrize('damage', ['missing', 'truncated'])
+def test_damaged_cache_is_rebuilt(tmp_path, damage):
+    fn = write_csv(tmp_path)
+    GitAnalysis('output.csv').import_csv(fn)
+    assert Cache.load_table(fn) is not None
+    column = os.path.join(Cache.path(fn), 'author.npy')
+    if damage == 'missing':
+        os.remove(column)
+    else:
+        with open(column, 'r+b') as f:
+            f.truncate(os.path.getsize(column) // 2)
+    assert Cache.load_table(fn) is None
+    ga = GitAnalysis('output.csv')
+    ga.import_csv(fn)
+    assert ga.commits.author.tolist() == ['Ann', 'Bob']
+    assert Cache.load_table(fn) is not None
@@ -0,0 +1,64 @@
+import warnings
+import pytest
+import numpy as np
+
+from GitAnalysis import CommitTable, GitLog
+
+
+def test_author_with_commas_and_missing_fields(tmp_path):
+    # Authors unquoted as written by gitlogs2csv.sh
+    fn = tmp_path / 'output.csv'
+    fn.write_text(','.join(GitLog.fields) + '\n'
+                  'a1,Doe, John,2020-01-01 10:00:00, 1, 5, 2,v1\n'
+                  'a2,Ann,2020-01-02 10:00:00, 2, 3, 0,\n'
+                  'a3,Doe, Jr., John,2020-01-03 10:00:00, 1, 1, 1,\n'
+                  'a4,Ann,2020-01-04 10:00:00\n'
+                  '\n')
+    with pytest.warns(UserWarning, match='1 rows'):
+        table = CommitTable.from_csv(str(fn))
+    assert table.commit_id.tolist() == ['a1', 'a2', 'a3']
+    assert table.author.tolist() == ['Doe, John', 'Ann', 'Doe, Jr., John']
+    assert table.lines_added.tolist() == [5, 3, 1]
+    assert table.tag.tolist() == ['v1', '', '']
+
+
+def test_no_warning_for_good_rows(tmp_path):
+    fn = tmp_path / 'output.csv'
+    fn.write_text(','.join(GitLog.fields) + '\n' + 'a1,"Doe, John",2020-01-01 10:00:00,1,5,2,v1\n')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        table = CommitTable.from_csv(str(fn))
+    assert table.author.tolist() == ['Doe, John']
+
+
+def random_table(n, seed=0):
+    rng = np.random.default_rng(seed)
+    tag = np.where(np.arange(n) % 50 == 49, np.char.add('v', np.arange(n).astype(str)), '')
+    # Unsorted timestamps with duplicates
+    timestamp = np.round(rng.uniform(16000, 16000 + n*0.1, n), 1)
+    return CommitTable({'commit_id': np.arange(n).astype(str), 'author': rng.integers(0, 20, n).astype(str),
+                        'date': np.full(n, ''), 'changed_files': rng.integers(1, 10, n),
+                        'lines_added': rng.integers(0, 100, n), 'lines_deleted': rng.integers(0, 50, n),
+                        'tag': tag, 'timestamp': timestamp})
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'step': 1.0}, {'at': [16050.5, 15000, 16010, 16200.3]}])
+def test_rolling_same_as_masks(kwargs):
+    table = random_table(2000)
+    out = table.rolling(9, **kwargs)
+    if 'at' in kwargs:
+        assert out['t'].tolist() == kwargs['at']
+    for w, t in enumerate(out['t']):
+        m = (table.timestamp > t - 9) & (table.timestamp <= t)
+        assert out['commits'][w] == m.sum()
+        assert out['authors'][w] == np.unique(table.author[m]).size
+        for attr in ('lines_altered', 'lines_weighted', 'changed_files'):
+            v = np.asarray(getattr(table, attr), dtype=float)[m]
+            assert np.isclose(out[f'{attr}_sum'][w], v.sum())
+            if m.any():
+                assert np.isclose(out[f'{attr}_mean'][w], v.mean())
+                assert np.isclose(out[f'{attr}_p50'][w], np.median(v))
+            else:
+                assert np.isnan(out[f'{attr}_mean'][w]) and np.isnan(out[f'{attr}_p50'][w])
+    if not kwargs:
+        assert out['tag'].tolist() == [x for x in table.tag[np.argsort(table.timestamp, kind='stable')] if x]
@@ -0,0 +1,113 @@
+import re
+import datetime
+import numpy as np
+import pytest
+
+from GitAnalysis import CommitTable, Correlation, GitLog
+
+
+def scan(*messages):
+    lines = []
+    for i, message in enumerate(messages):
+        lines.append(f'{GitLog.marker}c{i}')
+        lines.extend(message.split('\n'))
+    return list(Correlation.scan_lines(lines))
+
+
+@pytest.mark.parametrize('message', [
+    'Fixes: 54a4f0239f2e ("KVM: x86: fix the fix")',
+    'fix 2 typos',
+    'Fixes 3 compiler warnings',
+    'closes 1.2 regression',
+    'Resolved 10 conflicts',
+    'debug 5 times',
+    'bugs 12 and more'
+])
+def test_no_reference(message):
+    assert scan(message) == []
+
+
+@pytest.mark.parametrize('message, bug_id', [
+    ('Closes #123', 123),
+    ('Fixes: #123', 123),
+    ('fixes bug 123', 123),
+    ('Resolves bug #123.', 123),
+    ('bug 123 in the parser', 123),
+    ('BZ#123', 123),
+    ('see https://bugs.busybox.net/show_bug.cgi?id=123', 123)
+])
+def test_reference(message, bug_id):
+    assert scan(message) == [('c0', bug_id)]
+
+
+def test_scan_every_reference_once_per_commit():
+    refs = scan('Fix crash\n\nCloses #101', 'bug #102 and show_bug.cgi?id=101\nbug 102', 'Fixes bug 103')
+    assert refs == [('c0', 101), ('c1', 102), ('c1', 101), ('c2', 103)]
+
+
+def test_scanner_same_as_separate_patterns():
+    rng = np.random.default_rng(0)
+    styles = ['Closes #{}', 'Fixes: #{}', 'bug {} in the parser', 'see show_bug.cgi?id={}', 'BZ#{} and bug #{}',
+              'fix {} typos', 'Fixes: {}abcdef']
+    messages = [styles[i % len(styles)].format(*rng.integers(1, 1000, 2)) for i in range(500)]
+    separate = set()
+    for i, message in enumerate(messages):
+        for p in Correlation.patterns:
+            separate.update((f'c{i}', int(x)) for x in re.findall(p, message, re.IGNORECASE))
+    assert set(scan(*messages)) == separate
+
+
+def days(date):
+    return datetime.datetime.strptime(date, '%Y-%m-%d').replace(tzinfo=datetime.timezone.utc).timestamp() / (24*3600)
+
+
+def test_releases():
+    # Ten commits on the 15th of every month, tags at February, May and September
+    months = [1, 2, 3, 4, 5, 6, 7, 8, 9, 9]
+    tags = {2: 'v2', 5: 'v5', 9: 'v9'}
+    table = CommitTable({
+        'commit_id': [f'c{i}' for i in range(10)],
+        'author': ['a']*10,
+        'date': ['']*10,
+        'changed_files': [1]*10,
+        'lines_added': list(range(1, 11)),
+        'lines_deleted': [0]*10,
+        'tag': [tags.get(m, '') if i < 9 else '' for i, m in enumerate(months)],
+        'timestamp': [days(f'2020-{m:02d}-15') + i*1e-3 for i, m in enumerate(months)]
+    })
+    opened = [days(d)*24*3600 for d in ['2020-02-20', '2020-03-01', '2020-05-20', '2020-06-01', '2019-01-01']]
+    refs = [('c2', 101), ('c3', 102), ('c3', 101), ('c6', 103), ('c7', 104), ('c7', 2), ('x', 101)]
+    correlation = Correlation(table, [101, 102, 103, 104, 105], opened, refs)
+    out = correlation.releases()
+    assert out['release'] == ['v2', 'v5', 'v9', 'unreleased']
+    assert out['commits'].tolist() == [2, 3, 4, 1]
+    assert out['churn'].tolist() == [3, 12, 30, 10]
+    assert out['bugs'].tolist() == [2, 2, 0, 0]
+    assert out['bugs_window'].tolist() == [2, 2, 0, 0]
+    assert out['fixes'].tolist() == [0, 2, 2, 0]
+    assert out['fixed_bugs'].tolist() == [0, 2, 2, 0]
+    assert out['fix_churn'].tolist() == [0, 7, 15, 0]
+    # 101 at its last fix: April 15 - February 20, 102: April 15 - March 1
+    assert out['days_to_fix'][1] == pytest.approx((55 + 45) / 2, abs=0.01)
+    # 103: July 15 - May 20, 104: August 15 - June 1
+    assert out['days_to_fix'][2] == pytest.approx((56 + 75) / 2, abs=0.01)
+    assert np.isnan(out['days_to_fix'][0])
+
+
+def test_bugs_per_release_same_as_loop():
+    rng = np.random.default_rng(1)
+    n = 5000
+    timestamp = 16000 + np.cumsum(rng.uniform(0, 0.1, n))
+    tag = np.where(np.arange(n) % 97 == 96, 'v', '')
+    tag = np.char.add(tag, np.where(tag == 'v', np.arange(n).astype(str), ''))
+    table = CommitTable({'commit_id': np.arange(n).astype(str), 'author': np.full(n, 'a'), 'date': np.full(n, ''),
+                         'changed_files': np.ones(n), 'lines_added': rng.integers(0, 100, n),
+                         'lines_deleted': np.zeros(n), 'tag': tag, 'timestamp': timestamp})
+    bug_days = rng.uniform(timestamp[0] - 10, timestamp[-1] + 10, 3000)
+    out = Correlation(table, np.arange(3000), bug_days*24*3600).releases()
+    release_t = timestamp[tag != '']
+    naive = []
+    for k, t in enumerate(release_t):
+        t_next = release_t[k + 1] if k + 1 < release_t.size else np.inf
+        naive.append(sum(1 for b in bug_days if t <= b < t_next))
+    assert out['bugs'][:-1].tolist() == naive
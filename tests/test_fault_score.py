@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from GitAnalysis import GitAnalysis
+
+
+def double_loop(t, y, alfa):
+    # The loop used by plot2 before
+    p = np.full(t.size, 0.0)
+    for i, t1 in enumerate(t):
+        for t2 in t[i:]:
+            p[i] = p[i] + y[i]*GitAnalysis.exponential(t2 - t1, alfa)
+    return p
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 500])
+def test_same_as_double_loop(n):
+    alfa = -1.0 * np.log(0.05) / 30
+    rng = np.random.default_rng(n)
+    # Commits on the same day included
+    t = np.cumsum(np.round(rng.exponential(1.0, n)))
+    y = np.cumsum(rng.integers(0, 500, n)).astype(float)
+    p = GitAnalysis.fault_score(t, y, alfa)
+    assert p.shape == (n,)
+    assert np.allclose(p, double_loop(t, y, alfa), rtol=1e-9)
@@ -0,0 +1,134 @@
+from GitAnalysis import GitDiff, GitLog
+
+
+def lines(text):
+    return text.strip('\n').split('\n')
+
+
+def test_rename():
+    out = lines("""
+commit 1111111
+Author: Ann <ann@example.com>
+
+    Move and fix
+
+diff --git a/old.c b/new.c
+similarity index 90%
+rename from old.c
+rename to new.c
+index 83db48f..bf269f4 100644
+--- a/old.c
++++ b/new.c
+@@ -3 +3 @@ int main()
+-    return 1;
++    return 0;
+diff --git a/src/a.c b/lib/a.c
+similarity index 100%
+rename from src/a.c
+rename to lib/a.c
+""")
+    [[commit_id, altered_lines, renamed_files]] = GitDiff.parse(out)
+    assert commit_id is None
+    assert renamed_files == [{'from': 'old.c', 'to': 'new.c'}, {'from': 'src/a.c', 'to': 'lib/a.c'}]
+    assert altered_lines == {
+        'old.c': {'added': [], 'deleted': [(3, 1)]},
+        'new.c': {'added': [(3, 1)], 'deleted': []}
+    }
+
+
+def test_new_and_deleted_file():
+    out = lines("""
+diff --git a/new.c b/new.c
+new file mode 100644
+index 0000000..e69de29
+--- /dev/null
++++ b/new.c
+@@ -0,0 +1,3 @@
++int a;
++int b;
++int c;
+diff --git a/gone.c b/gone.c
+deleted file mode 100644
+index e69de29..0000000
+--- a/gone.c
++++ /dev/null
+@@ -1,2 +0,0 @@
+-int x;
+-int y;
+""")
+    [[_, altered_lines, renamed_files]] = GitDiff.parse(out)
+    assert renamed_files == []
+    assert altered_lines == {
+        'new.c': {'added': [(1, 3)], 'deleted': []},
+        'gone.c': {'added': [], 'deleted': [(1, 2)]}
+    }
+
+
+def test_empty_side_hunks():
+    # -N,0 inserts after line N, +N,0 deletes the lines after line N of the new file
+    out = lines("""
+--- a/f.c
++++ b/f.c
+@@ -10,3 +9,0 @@ void f()
+-a
+-b
+-c
+@@ -20,0 +18,2 @@ void g()
++d
++e
+@@ -30 +30,0 @@
+-f
+""")
+    [[_, altered_lines, _]] = GitDiff.parse(out)
+    assert altered_lines == {'f.c': {'added': [(18, 2)], 'deleted': [(30, 1), (10, 3)]}}
+
+
+def test_content_looking_like_a_header():
+    # Deleted '-- a/x' and added '++ b/y' lines of a file are content, not file headers
+    out = lines("""
+--- a/notes.txt
++++ b/notes.txt
+@@ -1,2 +1,2 @@
+--- a/x
+-rename from y
++++ b/y
++@@ -1 +1 @@
+@@ -5 +5 @@
+-old
++new
+""")
+    [[_, altered_lines, renamed_files]] = GitDiff.parse(out)
+    assert renamed_files == []
+    assert altered_lines == {'notes.txt': {'added': [(1, 2), (5, 1)], 'deleted': [(5, 1), (1, 2)]}}
+
+
+def test_two_commits_in_one_stream():
+    m = GitLog.marker
+    out = lines(f"""
+{m}aaaaaaa
+diff --git a/f.c b/f.c
+new file mode 100644
+--- /dev/null
++++ b/f.c
+@@ -0,0 +1,4 @@
++1
++2
++3
++4
+{m}bbbbbbb
+{m}ccccccc
+diff --git a/f.c b/g.c
+similarity index 75%
+rename from f.c
+rename to g.c
+--- a/f.c
++++ b/g.c
+@@ -2 +1,0 @@
+-2
+""")
+    assert list(GitDiff.parse(out, GitLog.marker)) == [
+        ['aaaaaaa', {'f.c': {'added': [(1, 4)], 'deleted': []}}, []],
+        ['bbbbbbb', {}, []],
+        ['ccccccc', {'f.c': {'added': [], 'deleted': [(2, 1)]}, 'g.c': {'added': [], 'deleted': []}},
+         [{'from': 'f.c', 'to': 'g.c'}]]
+    ]
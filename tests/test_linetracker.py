@@ -0,0 +1,97 @@
+import random
+
+from GitAnalysis import GitDiff, LineTracker
+
+
+def workload(n, commits, seed):
+    # Random hunks on a file of n lines as [commit, deleted, added, isReleaseCommit]
+    rnd = random.Random(seed)
+    out = []
+    size = n
+    for i in range(commits):
+        deleted = []
+        added = []
+        for _ in range(rnd.randint(1, 5) if size > 0 else 0):
+            length = rnd.randint(1, min(30, size))
+            start = rnd.randint(1, size - length + 1)
+            deleted.append((start, length))
+        deleted = GitDiff.normalize({'f': {'added': [], 'deleted': deleted}})['f']['deleted']
+        size -= sum(length for start, length in deleted)
+        for _ in range(rnd.randint(1, 5)):
+            added.append((rnd.randint(1, size + 1), rnd.randint(1, 30)))
+        added = GitDiff.normalize({'f': {'added': added, 'deleted': []}})['f']['added']
+        size += sum(length for start, length in added)
+        out.append([f'c{i}', deleted, added, i % 10 == 0])
+    return out
+
+
+def test_same_as_lists():
+    # Per-line lists as tracked by GitCommit2.track() before LineTracker
+    for seed, n in enumerate((1, 100, 2000)):
+        lines = ['N/A'] + ['c'] * n
+        commitcounter = ['N/A'] + [0] * n
+        releasecounter = ['N/A'] + [0] * n
+        tracker = LineTracker()
+        tracker.insert(1, n, 'c')
+        commit_clock = 0
+        release_clock = 0
+        for commit, deleted, added, isReleaseCommit in workload(n, 200, seed):
+            for first, length in deleted:
+                tracker.delete(first, length)
+            for l in GitDiff.expand({'f': {'added': [], 'deleted': deleted}})['f']['deleted']:
+                lines.pop(l)
+                commitcounter.pop(l)
+                releasecounter.pop(l)
+            for first, length in added:
+                tracker.insert(first, length, commit, commit_clock, release_clock)
+            for l in GitDiff.expand({'f': {'added': added, 'deleted': []}})['f']['added']:
+                lines.insert(l, commit)
+                commitcounter.insert(l, 0)
+                releasecounter.insert(l, 0)
+            for i in range(1, len(commitcounter)):
+                commitcounter[i] += 1
+                if isReleaseCommit:
+                    releasecounter[i] += 1
+            commit_clock += 1
+            if isReleaseCommit:
+                release_clock += 1
+            assert len(tracker) == len(lines) - 1
+            assert tracker.lines == lines
+            assert tracker.commitcounter(commit_clock) == commitcounter
+            assert tracker.releasecounter(release_clock) == releasecounter
+
+
+def test_copies_are_snapshots():
+    tracker = LineTracker()
+    tracker.insert(1, 10, 'a')
+    snapshot = tracker.copy()
+    tracker.delete(3, 4)
+    tracker.insert(2, 2, 'b')
+    assert snapshot.lines == ['N/A'] + ['a'] * 10
+    assert tracker.lines == ['N/A', 'a', 'b', 'b'] + ['a'] * 5
+    assert LineTracker.from_runs(tracker.to_runs()).lines == tracker.lines
+
+
+def depth(node):
+    out = 0
+    stack = [(node, 1)]
+    while stack:
+        [node, d] = stack.pop()
+        if node is not None:
+            out = max(out, d)
+            stack.append((node.left, d + 1))
+            stack.append((node.right, d + 1))
+    return out
+
+
+def test_depth_after_deletions_inside_one_run():
+    # Every 4th line of an 8000 line run deleted one by one, 2000 fragments of one run
+    tracker = LineTracker()
+    tracker.insert(1, 8000, 'c')
+    for line in range(8000 - 3, 0, -4):
+        tracker.delete(line, 1)
+    assert len(tracker) == 6000
+    assert len(list(tracker.runs())) == 2000
+    assert depth(tracker.root) < 100
+    lines = ['N/A'] + ['c'] * 6000
+    assert tracker.lines == lines
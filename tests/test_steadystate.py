@@ -0,0 +1,40 @@
+import numpy as np
+
+from GitAnalysis import GitAnalysis
+
+
+def check(t, y, min_dt, relative_band):
+    ref = GitAnalysis.findSteadyStateScan(t, y, min_dt, relative_band)
+    res = GitAnalysis.findSteadyState(t, y, min_dt, relative_band)
+    assert res[1] == ref[1]
+    assert np.array_equal(res[0], ref[0])
+
+
+def test_same_as_scan():
+    rnd = np.random.default_rng(0)
+    for n in (1, 2, 10, 1000, 5000):
+        for k in range(20):
+            t = np.cumsum(rnd.exponential(1.0, n))
+            # Bursts of commits with quiet periods, some equal values
+            y = np.cumsum(rnd.integers(0, 50, n) * (rnd.random(n) < 0.3)).astype(float)
+            y = y - y[0]
+            check(t, y, rnd.uniform(1, 50), rnd.uniform(0.0001, 0.05))
+
+
+def test_equal_timestamps_and_flat_signal():
+    t = np.repeat(np.arange(50, dtype=float), 3)
+    check(t, np.zeros(t.size), 5, 0.01)
+    check(t, np.floor(np.arange(t.size) / 10), 5, 0.01)
+
+
+def test_non_monotone_signal():
+    # Falls back to the scan
+    rnd = np.random.default_rng(1)
+    t = np.arange(500, dtype=float)
+    check(t, rnd.normal(100, 1, 500), 10, 0.02)
+
+
+def test_example():
+    x = np.array([1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20], dtype=float)
+    y = np.array([1,14,19,20,21,20,20,19,22,23,20,19,24,21,25,24,25,26,25,24], dtype=float)
+    check(x, y, 2, 3)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from GitAnalysis import GitAnalysis
+
+
+def direct(start, end, span, step, quantiles):
+    # Quantiles of the alive lines by a mask at every step
+    t = []
+    q = []
+    for x in np.arange(np.floor(start.min()), np.floor(end.max()), step*24*3600):
+        alive = span[(start <= x) & (end >= x) & (span >= 0)]
+        if alive.size:
+            t.append(x/24/3600)
+            q.append(np.quantile(alive, quantiles)/24/3600)
+    return [np.array(t), np.array(q).reshape(-1, len(quantiles))]
+
+
+@pytest.mark.parametrize('n, chunk', [(1, 4096), (50, 4096), (3000, 7)])
+def test_same_as_direct(n, chunk):
+    rng = np.random.default_rng(n)
+    start = rng.uniform(1.4e9, 1.5e9, n)
+    span = rng.exponential(90*24*3600, n)
+    # Gaps without alive lines and lines with negative timespans
+    start[::3] += 2e8
+    span[::11] *= -1
+    end = start + np.abs(span)
+    quantiles = [0.25, 0.5, 0.75]
+    [t, q] = GitAnalysis.survival_quantiles({'timestart': start, 'timeend': end, 'timespan': span}, 10, quantiles, chunk)
+    [t_ref, q_ref] = direct(start, end, span, 10, quantiles)
+    assert np.allclose(t, t_ref)
+    assert q.shape == (t_ref.size, 3)
+    assert np.allclose(q, q_ref)
+
+
+def test_rows_and_empty():
+    rows = [{'timestart': 0.0, 'timeend': 10*24*3600.0, 'timespan': 10*24*3600.0},
+            {'timestart': 0.0, 'timeend': 40*24*3600.0, 'timespan': 40*24*3600.0}]
+    [t, q] = GitAnalysis.survival_quantiles(rows, 5)
+    assert t.tolist() == [0, 5, 10, 15, 20, 25, 30, 35]
+    assert q[:, 0].tolist() == [25, 25, 25, 40, 40, 40, 40, 40]
+    [t, q] = GitAnalysis.survival_quantiles([], 5, [0.5, 0.9])
+    assert t.size == 0 and q.shape == (0, 2)
@@ -0,0 +1,41 @@
+import io
+import warnings
+import contextlib
+import pytest
+
+from GitAnalysis import GitCommit2
+
+
+@pytest.fixture(scope='module')
+def tracked(synthetic):
+    test = GitCommit2(synthetic)
+    commits = test.get_all_commits()
+    tags = test.get_all_tags()
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter('ignore')
+        [stats, history] = test.track(commits, tags)
+    return [test, commits, tags, stats, history]
+
+
+@pytest.mark.parametrize('processes', [1, 2, 3])
+def test_same_as_track(tracked, processes):
+    [test, commits, tags, stats, history] = tracked
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        [p_stats, p_history] = test.track_parallel(commits, tags, 'all', processes)
+    assert p_stats == stats
+    assert list(p_history) == list(history)
+    for c in history:
+        assert p_history[c]['timestamp'] == history[c]['timestamp']
+        assert p_history[c]['clock'] == history[c]['clock']
+        assert {f: t.to_runs() for f, t in p_history[c]['tracker'].items()} == \
+            {f: t.to_runs() for f, t in history[c]['tracker'].items()}
+
+
+def test_without_history(tracked):
+    [test, commits, tags, stats, history] = tracked
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        [p_stats, p_history] = test.track_parallel(commits, tags, None, 2)
+    assert p_stats == stats
+    assert p_history is None
@@ -0,0 +1,24 @@
+import io
+import warnings
+import contextlib
+
+from GitAnalysis import GitCommit2
+
+
+def test_policies_give_the_same_states(synthetic):
+    test = GitCommit2(synthetic)
+    commits = test.get_all_commits()
+    tags = test.get_all_tags()
+    histories = {}
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter('ignore')
+        for policy in ('all', 'release', 7):
+            histories[policy] = test.track(commits, tags, policy)[1]
+    # Every commit is a checkpoint, no deltas are kept
+    assert all(delta is None for delta in histories['all'].deltas)
+    assert len(histories['release'].checkpoints) < len(histories['release'])
+    for c in histories['all']:
+        expected = {f: t.to_runs() for f, t in histories['all'][c]['tracker'].items()}
+        for policy in ('release', 7):
+            assert histories[policy][c]['clock'] == histories['all'][c]['clock']
+            assert {f: t.to_runs() for f, t in histories[policy][c]['tracker'].items()} == expected
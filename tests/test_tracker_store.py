@@ -0,0 +1,51 @@
+import io
+import warnings
+import contextlib
+import pytest
+
+from GitAnalysis import GitCommit2, TrackerStore
+
+
+def quiet(f, *args, **kwargs):
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter('ignore')
+        return f(*args, **kwargs)
+
+
+def interrupted(commits, k):
+    # Like a run killed after k commits, the state after the last checkpoint is kept
+    yield from commits[:k]
+    raise KeyboardInterrupt
+
+
+@pytest.fixture(scope='module')
+def tracked(synthetic):
+    test = GitCommit2(synthetic)
+    commits = test.get_all_commits()
+    tags = test.get_all_tags()
+    [stats, history] = quiet(test.track, commits, tags)
+    final = history[list(history)[-1]]['tracker']
+    return [test, commits, tags, stats, {f: t.to_runs() for f, t in final.items()}]
+
+
+@pytest.mark.parametrize('k', [20, 150, 399])
+@pytest.mark.parametrize('stop', ['end', 'interrupt'])
+def test_resume_same_as_track(tracked, tmp_path, k, stop):
+    [test, commits, tags, stats, final] = tracked
+    fn = str(tmp_path / 'tracker.db')
+    store = TrackerStore(fn)
+    if stop == 'end':
+        quiet(test.track, commits[:k], tags, 'release', store, 7)
+    else:
+        with pytest.raises(KeyboardInterrupt):
+            quiet(test.track, interrupted(commits, k), tags, 'release', store, 7)
+    store.close()
+    store = TrackerStore(fn)
+    assert 0 < len(store) <= k
+    [r_stats, _] = quiet(test.track, commits, tags, 'release', store, 7)
+    store.close()
+    assert r_stats == stats
+    store = TrackerStore(fn)
+    assert len(store) == len(commits)
+    assert {f: t.to_runs() for f, t in store.load()['tracker'].items()} == final
+    store.close()